@@ -0,0 +1,78 @@
+import os
+import pygame
+from utils import get_mask_rect
+
+
+class AssetManager:
+    """Process wide cache of loaded images, keyed by (path, size, flags).
+
+    Surfaces are shared between every caller, so treat them as read only and transform copies instead.
+    Supported flags: 'flip_x', 'flip_y', 'no_alpha' (convert() instead of convert_alpha())."""
+
+    def __init__(self):
+        self.images = {}
+        self.masks = {}
+        self.mask_rects = {}  # loaded image -> get_mask_rect(image), only for the shared images of self.images
+        self.shared = set()  # the surfaces of self.images
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0  # files actually read from disk
+
+    @staticmethod
+    def key(path, size=None, flags=()):
+        return os.path.normpath(path), tuple(size) if size else None, tuple(sorted(flags))
+
+    def load(self, path, size, flags):
+        if not size and 'flip_x' not in flags and 'flip_y' not in flags:
+            image = pygame.image.load(path)
+            self.loads += 1
+            return image.convert() if 'no_alpha' in flags else image.convert_alpha()
+        image = self.image(path, None, [flag for flag in flags if flag == 'no_alpha'])  # scaled variants share one read
+        if size:
+            image = pygame.transform.scale(image, size)
+        if 'flip_x' in flags or 'flip_y' in flags:
+            image = pygame.transform.flip(image, 'flip_x' in flags, 'flip_y' in flags)
+        return image
+
+    def image(self, path, size=None, flags=()):
+        key = self.key(path, size, flags)
+        if key in self.images:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.images[key] = self.load(path, key[1], key[2])
+            self.shared.add(self.images[key])
+        return self.images[key]
+
+    def mask(self, path, size=None, flags=()):
+        key = self.key(path, size, flags)
+        if key not in self.masks:
+            self.masks[key] = pygame.mask.from_surface(self.image(path, size, flags))
+        return self.masks[key]
+
+    def mask_rect(self, image, x=0, y=0):
+        """get_mask_rect, cached for the images loaded here since they are read only. Any other surface may have been
+        drawn on since the last call, its rect is worked out again."""
+        if image not in self.shared:
+            return get_mask_rect(image, x, y)
+        if image not in self.mask_rects:
+            self.mask_rects[image] = get_mask_rect(image)
+        rect = self.mask_rects[image]
+        return rect.move(x, y) if rect else rect
+
+    def preload(self, paths, size=None, flags=()):
+        for path in paths:
+            self.image(path, size, flags)
+
+    def stats(self):
+        return {'images': len(self.images), 'masks': len(self.masks),
+                'hits': self.hits, 'misses': self.misses, 'loads': self.loads}
+
+    def clear(self):
+        self.images.clear()
+        self.masks.clear()
+        self.mask_rects.clear()
+        self.shared.clear()
+
+
+assets = AssetManager()
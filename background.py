@@ -1,4 +1,4 @@
-import random
+from random_manager import rng
 
 import pygame
 import utils as utils
@@ -21,6 +21,7 @@ class BackgroundEffects:
         self.circles = []
         self.counter = 0
         self.dest_surf = pygame.Surface((utils.world_size[0], utils.world_size[1]), pygame.SRCALPHA).convert_alpha()
+        self.circle_rects = []  # screen rects of circles drawn last frame
 
     def update(self):
         if self.counter == 3:
@@ -31,19 +32,27 @@ class BackgroundEffects:
                     self.circles.remove(circle)
         else:
             self.counter += 1
-        if random.randint(1, 25) == 1:
+        if rng.cosmetic.randint(1, 25) == 1:
             self.add_circle()
 
     def add_circle(self):
-        radius = random.randint(4, 25)
-        color = random.choice(self.colors)
-        x, y = random.randint(-25, utils.world_size[0] / 4 + 25), utils.world_size[1] / 4
-        width = random.randint(0, 25)
+        radius = rng.cosmetic.randint(4, 25)
+        color = rng.cosmetic.choice(self.colors)
+        x, y = rng.cosmetic.randint(-25, utils.world_size[0] / 4 + 25), utils.world_size[1] / 4
+        width = rng.cosmetic.randint(0, 25)
         self.circles.append(self.Circle(radius, color, x, y, width))
 
     def draw(self, surface):
         self.surface.fill((0, 0, 0, 0))
+        circle_rects = []
         for circle in self.circles:
-            pygame.draw.circle(self.surface, circle.color, (circle.x, circle.y), circle.radius, circle.width)
-        surface.blit(pygame.transform.scale(self.surface, (utils.world_size[0], utils.world_size[1]), self.dest_surf),
-                     (0, 0))
\ No newline at end of file
+            rect = pygame.draw.circle(self.surface, circle.color, (circle.x, circle.y), circle.radius, circle.width)
+            circle_rects.append(pygame.Rect(rect.x * 4, rect.y * 4, rect.width * 4, rect.height * 4))
+        scaled = pygame.transform.scale(self.surface, (utils.world_size[0], utils.world_size[1]), self.dest_surf)
+        if hasattr(surface, 'mark_dirty'):  # report only the circles, not the whole background
+            pygame.Surface.blit(surface, scaled, (0, 0))
+            for rect in circle_rects + self.circle_rects:
+                surface.mark_dirty(rect)
+        else:
+            surface.blit(scaled, (0, 0))
+        self.circle_rects = circle_rects
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""Bullet and melee hit detection: full enemy_list scan against the EnemyManager spatial hash.
+
+Run from anywhere: python benchmarks/bench_broadphase.py
+"""
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+
+from spatial_hash import SpatialHash
+
+
+class FakeEnemy:
+    image = pygame.Surface((64, 64), pygame.SRCALPHA)
+    pygame.draw.ellipse(image, (255, 255, 255), (10, 20, 44, 40))
+
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 64, 64)
+        self.hitbox = pygame.Rect(0, 0, 40, 30)
+        self.hitbox.midbottom = self.rect.midbottom
+
+
+class FakeWeapon:
+    image = pygame.Surface((36, 90), pygame.SRCALPHA)
+    image.fill((255, 255, 255))
+
+    def __init__(self, x, y):
+        self.rect = self.image.get_rect(center=(x, y))
+
+
+def make_room(enemies, bullets):
+    enemy_list = [FakeEnemy(random.randint(196, 1082), random.randint(162, 586)) for _ in range(enemies)]
+    bullet_rects = [pygame.Rect(random.randint(64, 1280), random.randint(32, 800), 12, 12) for _ in range(bullets)]
+    weapon = FakeWeapon(random.randint(196, 1082), random.randint(162, 586))
+    return enemy_list, bullet_rects, weapon
+
+
+def scan_hits(enemy_list, bullet_rects, weapon):
+    hits = [[enemy for enemy in enemy_list if rect.colliderect(enemy.hitbox)] for rect in bullet_rects]
+    hits.append([enemy for enemy in enemy_list if pygame.sprite.collide_mask(weapon, enemy)])
+    return hits
+
+
+def hash_hits(enemy_list, bullet_rects, weapon, enemy_hash):
+    enemy_hash.clear()  # rebuilt once per tick, as in EnemyManager.update_enemies
+    for enemy in enemy_list:
+        enemy_hash.insert(enemy, enemy.rect.union(enemy.hitbox))
+    hits = [[enemy for enemy in enemy_hash.query(rect) if rect.colliderect(enemy.hitbox)] for rect in bullet_rects]
+    hits.append([enemy for enemy in enemy_hash.query(weapon.rect) if pygame.sprite.collide_mask(weapon, enemy)])
+    return hits
+
+
+def best_of(tick, ticks, repeats=5):
+    """Fastest average ms per tick over a few repeats, to keep scheduler noise out"""
+    results = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(ticks):
+            tick()
+        results.append((time.perf_counter() - start) / ticks * 1000)
+    return min(results)
+
+
+def main(enemies=60, bullets=250, ticks=200):
+    random.seed(0)
+    enemy_list, bullet_rects, weapon = make_room(enemies, bullets)
+    enemy_hash = SpatialHash()
+    assert scan_hits(enemy_list, bullet_rects, weapon) == hash_hits(enemy_list, bullet_rects, weapon, enemy_hash)
+
+    scan_ms = best_of(lambda: scan_hits(enemy_list, bullet_rects, weapon), ticks)
+    hash_ms = best_of(lambda: hash_hits(enemy_list, bullet_rects, weapon, enemy_hash), ticks)
+
+    print(f'{enemies} enemies, {bullets} bullets, 1 weapon swing')
+    print(f'linear scan:  {scan_ms:.3f} ms/tick')
+    print(f'spatial hash: {hash_ms:.3f} ms/tick')
+    print(f'speedup:      {scan_ms / hash_ms:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Python heap per instance of the types the game creates in bulk, and how many of each fit in a fixed budget.
+
+Run from anywhere: python benchmarks/bench_memory.py [--budget MiB]
+Pixel data of pygame surfaces lives outside the Python heap and is not counted, coin images are shared anyway.
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from types import SimpleNamespace
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+from coin import Coin
+from map_generator import Room
+from particles import EnemyHitParticle, WallHitParticle, ChestParticle, Dust, DeathAnimation
+from weapon import ImpBullet
+
+game = SimpleNamespace()
+master = SimpleNamespace(damage=10, name='imp')
+player = SimpleNamespace(velocity=[0, 0])
+room = Room(0, 0)
+
+types = {
+    'ImpBullet': lambda i: ImpBullet(game, master, room, i % 900, 300, (640, 400)),
+    'Coin': lambda i: Coin(game, room),
+    'Coin (dropped)': lambda i: dropped(Coin(game, room)),
+    'EnemyHitParticle': lambda i: EnemyHitParticle(game, i % 900, 300),
+    'WallHitParticle': lambda i: WallHitParticle(game, i % 900, 300),
+    'ChestParticle': lambda i: ChestParticle(game, i % 900, 300, room),
+    'Dust': lambda i: Dust(game, player, i % 900, 300),
+    'DeathAnimation': lambda i: DeathAnimation(game, i % 900, 300, master),
+    'Room': lambda i: Room(i % 64, i // 64),
+}
+if not os.path.isdir('src/assets/misc/death'):  # its frames are not part of the repository
+    del types['DeathAnimation']
+
+
+def dropped(coin):
+    coin.activate_bounce()
+    return coin
+
+
+def footprint(factory, count):
+    """Bytes of Python heap kept alive per instance, including its helper objects"""
+    factory(0)  # loads shared images before measuring
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(instances)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budget', type=float, default=16, help='MiB of Python heap')
+    parser.add_argument('--count', type=int, default=2000, help='instances measured per type')
+    args = parser.parse_args()
+    budget = args.budget * 1024 * 1024
+    print(f'{"type":<20}{"bytes":>10}{f"per {args.budget:g} MiB":>16}')
+    for name, factory in types.items():
+        size = footprint(factory, args.count)
+        print(f'{name:<20}{size:>10.0f}{int(budget // size):>16,}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Particle burst: per-object particles against the NumPy ParticleBuffer.
+
+Run from anywhere: python benchmarks/bench_particles.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+import utils
+from particles import ParticleManager, EnemyHitParticle, WallHitParticle
+
+
+class FakeGame:
+    def __init__(self):
+        self.particle_manager = ParticleManager(self)
+
+
+def burst(game, count):
+    manager = game.particle_manager
+    if manager.vectorized:  # emitters add a whole burst at once
+        for i in range(0, count, 50):
+            manager.emit('enemy_hit', 200 + i % 900, 150 + i % 500, 25)
+            manager.emit('wall_hit', 200 + i % 900, 150 + i % 500, 25)
+        return
+    for i in range(count):
+        particle_type = EnemyHitParticle if i % 2 else WallHitParticle
+        manager.add_particle(particle_type(game, 200 + i % 900, 150 + i % 500))
+
+
+def run(vectorized, count, frames):
+    ParticleManager.vectorized = vectorized
+    game = FakeGame()
+    surface = pygame.Surface(utils.world_size).convert()
+    start = time.perf_counter()
+    for frame in range(frames):
+        if frame % 10 == 0:
+            burst(game, count)
+        game.particle_manager.update_particles()
+        game.particle_manager.draw_particles(surface)
+    alive = len(game.particle_manager.particle_list) + len(game.particle_manager.particle_buffer)
+    return (time.perf_counter() - start) / frames * 1000, alive
+
+
+def main(count=2000, frames=120):
+    objects_ms, objects_alive = run(False, count, frames)
+    buffer_ms, buffer_alive = run(True, count, frames)
+    print(f'burst of {count} particles every 10 frames')
+    print(f'objects:     {objects_ms:.3f} ms/frame ({objects_alive} alive at the end)')
+    print(f'numpy arrays: {buffer_ms:.3f} ms/frame ({buffer_alive} alive at the end)')
+    print(f'speedup:      {objects_ms / buffer_ms:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
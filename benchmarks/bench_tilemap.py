@@ -0,0 +1,63 @@
+"""Frame-time comparison of TileMap's layered (dirty region restore) and copy compositing paths.
+
+Run from anywhere: python benchmarks/bench_tilemap.py
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+import utils
+from map import TileMap
+
+
+def room_layers(width=19, height=12):
+    """Two synthetic layers: random floor tiles surrounded by walls"""
+    floor = [[random.choice(utils.floor_tiles) for _ in range(width)] for _ in range(height)]
+    walls = [[utils.wall_list[0] if x in (0, width - 1) or y in (0, height - 1) else -1
+              for x in range(width)] for y in range(height)]
+    return [floor, walls]
+
+
+def frame(tile_map, screen, sprite, sprites=30):
+    for i in range(sprites):
+        tile_map.map_surface.blit(sprite, (200 + i * 25, 200 + (i * 37) % 400))
+        utils.mark_dirty(tile_map.map_surface,
+                         pygame.draw.circle(tile_map.map_surface, (255, 0, 0), (300 + i * 20, 500), 5))
+    tile_map.draw_map(screen)
+
+
+def run(layered, frames):
+    tile_map = TileMap(None, room_layers(), layered=layered)
+    screen = pygame.Surface(utils.world_size).convert()
+    sprite = pygame.Surface(utils.basic_entity_size, pygame.SRCALPHA).convert_alpha()
+    sprite.fill((200, 100, 50, 255))
+    frame(tile_map, screen, sprite)  # warm up
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame(tile_map, screen, sprite)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main(frames=500):
+    random.seed(0)
+    copy_ms = run(False, frames)
+    layered_ms = run(True, frames)
+    print(f'copy path:    {copy_ms:.3f} ms/frame')
+    print(f'layered path: {layered_ms:.3f} ms/frame')
+    print(f'speedup:      {copy_ms / layered_ms:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Floor planning time against the number of rooms: the restarting random walk against the growing tree.
+
+Run from anywhere: python benchmarks/bench_worldgen.py
+"""
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from map_generator import World, Room
+
+
+def plan(generator, rooms, size, seeds):
+    """Average ms per floor over seeds, planned without TileMaps as in the background worker"""
+    World.generator = generator
+    world_manager = SimpleNamespace(level=2)
+    start = time.perf_counter()
+    for seed in range(seeds):
+        world = World(world_manager, None, rooms, size, size, random.Random(seed), build=False)
+        assert sum(isinstance(room, Room) for row in world.world for room in row) == rooms
+    return (time.perf_counter() - start) / seeds * 1000
+
+
+def main():
+    print(f'{"generator":<10}{"grid":>8}{"rooms":>8}{"ms/floor":>12}{"us/room":>10}')
+    for generator, size, rooms, seeds in (('walk', 4, 8, 50), ('walk', 4, 10, 50), ('walk', 4, 12, 20),
+                                          ('walk', 4, 14, 5), ('tree', 4, 14, 50), ('tree', 32, 256, 10),
+                                          ('tree', 32, 1024, 5), ('tree', 64, 4096, 2)):
+        ms = plan(generator, rooms, size, seeds)
+        print(f'{generator:<10}{f"{size}x{size}":>8}{rooms:>8}{ms:>12.2f}{ms / rooms * 1000:>10.1f}')
+    World.generator = 'walk'
+
+
+if __name__ == '__main__':
+    main()
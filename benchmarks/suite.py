@@ -0,0 +1,359 @@
+"""Benchmark suite: world generation, room construction, rendering, collisions, bullets, enemies and particle bursts,
+timed in a seeded headless game and compared against a stored baseline.
+
+python benchmarks/suite.py                       run every case, write benchmarks/results.json
+python benchmarks/suite.py --save-baseline       also store the results as benchmarks/baseline.json
+python benchmarks/suite.py draw_frame wall_collision
+Exits with status 1 when a case fails or is slower than its baseline by more than --tolerance. Rooms are built from
+the layers in maps/, or from the small ones in tests/maps when maps/ is missing.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+
+from controls import ScriptedInput
+from game import Game
+from map import TileMap
+from map_generator import World, room_templates
+from enemy import Imp, Enemy
+from coin import Coin
+from particles import ChestParticle, DeathAnimation
+from weapon import ImpBullet, BossBullet
+from random_manager import rng
+from pool import pool
+
+BENCHMARKS = os.path.join(ROOT, 'benchmarks')
+cases = {}  # name -> (function, unit)
+
+
+def case(name, unit):
+    def register(function):
+        cases[name] = (function, unit)
+        return function
+    return register
+
+
+def best_of(run, number=1, repeats=5):
+    """Fastest average ms per call of run over a few repeats, to keep scheduler noise out"""
+    results = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        results.append((time.perf_counter() - start) / number * 1000)
+    return min(results)
+
+
+def make_game(seed=1):
+    idle = ScriptedInput([(set(), (640, 400), (False, False, False))])
+    game = Game(headless=True, controls=idle, seed=seed)
+    game.enemy_manager.add_enemies()
+    return game
+
+
+def enter_room(game, room_type):
+    """Moves the player into the first room of the type, as if it walked through the door"""
+    world_manager = game.world_manager
+    room = next(room for row in world_manager.world.world for room in row if room and room.type == room_type)
+    world_manager.x, world_manager.y = room.x, room.y
+    world_manager.set_current_room(room)
+    game.player.rect.center = (21 * 64 / 2, 9 * 64)
+    game.player.update_hitbox()
+    return room
+
+
+def frame(game):
+    pygame.Surface.fill(game.screen, (0, 0, 0))
+    game.update_groups()
+    game.draw_groups()
+
+
+@case('world_generation', 'ms/world')
+def world_generation(game, seeds=10):
+    world_manager = game.world_manager
+
+    def generate():
+        for seed in range(seeds):
+            rng.seed(seed)
+            World(world_manager, game, world_manager.number_of_rooms, world_manager.world_width,
+                  world_manager.world_height)
+    return best_of(generate, repeats=3) / seeds
+
+
+@case('world_planning', 'ms/world')
+def world_planning(game, seeds=50, size=8):
+    """Rooms, types and tile layers of a bigger floor, without the TileMaps"""
+    world_manager = game.world_manager
+
+    def plan():
+        for seed in range(seeds):
+            rng.seed(seed)
+            World(world_manager, game, size * 2, size, size, build=False)
+    return best_of(plan, repeats=3) / seeds
+
+
+@case('tilemap_construction', 'ms/room')
+def tilemap_construction(game):
+    room = game.world_manager.current_room
+    return best_of(lambda: TileMap(room, room.room_map).materialize(), number=5)
+
+
+@case('level_transition', 'ms/worst frame')
+def level_transition(game, repeats=3):
+    """Slowest frame of the fall into the next level, as the player jumps into the hole long after the level
+    started, the next world has been planned in the background by then"""
+    world_manager = game.world_manager
+    worst = []
+    for _ in range(repeats):
+        world_manager.next_world.result()
+        world_manager.load_new_level()
+        slowest = 0
+        while world_manager.new_level or world_manager.move_current_room:
+            start = time.perf_counter()
+            frame(game)
+            slowest = max(slowest, time.perf_counter() - start)
+        worst.append(slowest * 1000)
+    return min(worst)
+
+
+@case('draw_frame', 'ms/frame')
+def draw_frame(game, frames=120):
+    enter_room(game, 'normal')
+    frame(game)  # lets the managers pick up the room
+
+    def draw():
+        pygame.Surface.fill(game.screen, (0, 0, 0))
+        game.draw_groups()
+    return best_of(draw, number=frames)
+
+
+@case('wall_collision', 'ms/1000 queries')
+def wall_collision(game, queries=1000):
+    tile_map = game.world_manager.current_map
+    rng.seed(2)
+    points = [(rng.worldgen.randint(0, 1344), rng.worldgen.randint(0, 896)) for _ in range(queries)]
+    return best_of(lambda: [tile_map.wall_collision((point,)) for point in points], number=20)
+
+
+@case('bullet_storm', 'ms/frame')
+def bullet_storm(game, bullets=300, frames=120):
+    room = enter_room(game, 'normal')
+    room.enemy_list.clear()
+    imp = Imp(game, 10, 100, room)
+    imp.rect.center = (21 * 64 / 2, 5 * 64)
+    game.player.shield = 10 ** 9  # hits only cost shield, the storm is not cut short by the player dying
+    rng.seed(3)
+    targets = [(rng.worldgen.randint(200, 1100), rng.worldgen.randint(150, 650)) for _ in range(bullets)]
+    manager = game.bullet_manager
+
+    def storm_frame():
+        for target in targets[len(manager.bullets):]:  # keep the storm at full size
+            manager.add_bullet(pool.acquire(ImpBullet, game, imp, room, *imp.rect.center, target))
+        manager.update()
+        manager.draw()
+        room.tile_map.clear_map()
+    result = best_of(storm_frame, number=frames)
+    manager.bullets.clear()
+    return result
+
+
+@case('bullet_hell', 'ms/frame')
+def bullet_hell(game, ring=24, frames=120, batched=True):
+    """A boss rotation spread: a ring of BossBullets from the middle of the room every frame, turning a few degrees
+    per ring, about 1300 bullets alive once the first rings reach the walls"""
+    room = enter_room(game, 'normal')
+    room.enemy_list.clear()
+    boss = SimpleNamespace(bullet_damage=1, room=room)
+    game.player.shield = 10 ** 9
+    manager = game.bullet_manager
+    manager.batched = batched
+    x, y = 21 * 64 / 2, 6 * 64
+    turn = iter(range(10 ** 9))
+
+    def hell_frame():
+        rotation = next(turn) * 7
+        for i in range(ring):
+            manager.add_bullet(pool.acquire(BossBullet, game, boss, room, x, y, (x, y - 100), rotation + i * 360 / ring))
+        manager.update()
+        manager.draw()
+        room.tile_map.clear_map()
+    for _ in range(frames):  # fill the room first
+        hell_frame()
+    result = best_of(hell_frame, number=frames)
+    manager.bullets.clear()
+    return result
+
+
+@case('chase', 'ms/frame')
+def chase(game, enemies=40, frames=120):
+    """Enemies chasing the player along the room's flow field while it circles the room, changing cell every few
+    frames"""
+    room = enter_room(game, 'normal')
+    room.objects = []
+    game.player.shield = 10 ** 9
+    room.enemy_list = [Enemy(game, 100, room, 'bat') for _ in range(enemies)]
+    for enemy in room.enemy_list:
+        enemy.spawn()
+        enemy.speed = 250  # change_speed sets it only once 1.5 s of game time have passed
+    game.dt = 1 / 60
+    step = iter(range(10 ** 9))
+
+    def chase_frame():
+        angle = next(step) / 30
+        game.player.rect.center = (21 * 64 / 2 + 300 * math.cos(angle), 7 * 64 + 150 * math.sin(angle))
+        game.player.update_hitbox()
+        game.enemy_manager.update_enemies()
+    result = best_of(chase_frame, number=frames)
+    room.enemy_list = []
+    return result
+
+
+@case('bat_swarm', 'ms/frame')
+def bat_swarm(game, bats=200, frames=120, batched=True):
+    """Whole frames of a room of bats fleeing a circling player and shooting once they stop, 16.7 ms is 60 FPS"""
+    room = enter_room(game, 'normal')
+    room.objects = []
+    game.player.shield = 10 ** 9
+    game.enemy_manager.batched = game.bullet_manager.batched = batched
+    room.enemy_list = [Imp(game, 10, 100, room) for _ in range(bats)]
+    for bat in room.enemy_list:
+        bat.spawn()
+    step = iter(range(10 ** 9))
+
+    def swarm_frame():
+        angle = next(step) / 30
+        game.player.rect.center = (21 * 64 / 2 + 300 * math.cos(angle), 7 * 64 + 150 * math.sin(angle))
+        game.player.update_hitbox()
+        frame(game)
+    for _ in range(frames // 4):  # let the first volleys fill the room
+        swarm_frame()
+    result = best_of(swarm_frame, number=frames, repeats=3)
+    room.enemy_list = []
+    game.bullet_manager.bullets.clear()
+    return result
+
+
+@case('chest_opening', 'ms/frame')
+def chest_opening(game, chests=3, frames=240):
+    """The end of a chest opening: sparkles and the coin shower of Chest.drop_items. Chest itself cannot be built
+    here, add_treasure refers to flask and power up objects the tree does not define yet."""
+    def open_chests():
+        room = game.world_manager.current_room  # not every floor has a chest room
+        room.objects = []
+        source = SimpleNamespace(room=room)  # what ChestParticle needs from its chest
+        for i in range(chests):
+            x, y = 21 * 64 / 2 + (i - 1) * 200, 7 * 64
+            for _ in range(rng.loot.randint(20, 30)):
+                coin = pool.acquire(Coin, game, room)
+                coin.rect.midtop = (x, y)
+                coin.dropped = True
+                coin.activate_bounce()
+                coin.bounce.x, coin.bounce.y = x, y
+                room.objects.append(coin)
+            for _ in range(20):
+                game.particle_manager.add_particle(pool.acquire(ChestParticle, game, x, y, source))
+        for _ in range(frames):
+            frame(game)
+    return best_of(open_chests, repeats=3) / frames
+
+
+@case('mass_deaths', 'ms/frame')
+def mass_deaths(game, enemies=40, frames=120):
+    def kill_all():
+        room = enter_room(game, 'normal')
+        room.objects = []
+        room.enemy_list = [Imp(game, 10, 100, room) for _ in range(enemies)]
+        for enemy in room.enemy_list:  # what Entity.detect_death does once the death animation ends
+            enemy.spawn()
+            enemy.drop_items()
+            game.particle_manager.add_particle(DeathAnimation(game, enemy.rect.x, enemy.rect.y, enemy))
+        room.enemy_list = []
+        for _ in range(frames):
+            frame(game)
+    return best_of(kill_all, repeats=3) / frames
+
+
+def run(names, seed=1):
+    """Times the cases, a case that raises is reported and recorded with its error instead of a value"""
+    results = {}
+    for name in names:
+        function, unit = cases[name]
+        try:
+            game = make_game(seed)  # a fresh floor per case so cases do not see each other's leftovers
+            value = function(game)
+        except Exception as error:  # one broken case must not cost the results of the others
+            results[name] = {'error': f'{type(error).__name__}: {error}', 'unit': unit}
+            print(f'{name:<24}{"failed":>10} {results[name]["error"]}')
+            continue
+        results[name] = {'value': round(value, 4), 'unit': unit}
+        print(f'{name:<24}{results[name]["value"]:>10.3f} {unit}')
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Prints the change against the baseline, returns the names of cases that got slower than the tolerance"""
+    regressions = []
+    for name, result in results.items():
+        if 'value' not in result or 'value' not in baseline.get(name, {}):
+            continue
+        before = baseline[name]['value']
+        change = result['value'] / before - 1 if before else 0
+        status = ''
+        if change > tolerance:
+            status = '  REGRESSION'
+            regressions.append(name)
+        print(f'{name:<24}{before:>10.3f} -> {result["value"]:.3f} {result["unit"]} ({change:+.1%}){status}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('cases', nargs='*', help=f'cases to run, all by default: {", ".join(cases)}')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default=os.path.join(BENCHMARKS, 'results.json'))
+    parser.add_argument('--baseline', default=os.path.join(BENCHMARKS, 'baseline.json'))
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed slowdown, 0.15 is 15%%')
+    parser.add_argument('--maps', help='directory of the room CSV layers, maps or tests/maps when maps is missing')
+    args = parser.parse_args()
+    unknown = set(args.cases) - set(cases)
+    if unknown:
+        parser.error(f'unknown cases: {", ".join(sorted(unknown))}')
+
+    room_templates.path = args.maps or ('maps' if os.path.isdir('maps') else os.path.join('tests', 'maps'))
+    results = run(args.cases or list(cases), args.seed)
+    report = {'seed': args.seed, 'maps': room_templates.path, 'python': platform.python_version(),
+              'pygame': pygame.version.ver, 'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    regressions = []
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f'\ncompared with {os.path.relpath(args.baseline, ROOT)}')
+        if baseline.get('maps', room_templates.path) != room_templates.path:
+            print(f'the baseline was taken on the rooms of {baseline["maps"]}, these on {room_templates.path}')
+        regressions = compare(results, baseline['results'], args.tolerance)
+    failed = [name for name, result in results.items() if 'error' in result]
+    sys.exit(1 if regressions or failed else 0)
+
+
+if __name__ == '__main__':
+    main()
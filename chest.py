@@ -1,12 +1,13 @@
-import numpy.random
 import pygame
-import random
+from random_manager import rng
 from numpy.random import choice as np
 import utils as utils
 from particles import ChestParticle
 from weapon import DestroyerCannon, Revolver, Katana, Bow, Armyknife, Shotgun
 from object import Object
 from coin import Coin, Emerald, Ruby
+from asset_manager import assets
+from pool import pool
 
 
 class Chest(Object):
@@ -33,42 +34,36 @@ class Chest(Object):
                  ShieldPowerUp(self.game, self.room), AttackPowerUp(self.game, self.room),
                  GreenFlask(self.game, self.room), Katana(self.game, self.room),
                  Shotgun(self.game, self.room)]
-        items = numpy.random.choice(items, size=3, replace=False, p=[0.03, 0.01, 0.2, 0.2, 0.5, 0.03, 0.03])
+        items = rng.numpy_stream('loot').choice(items, size=3, replace=False, p=[0.03, 0.01, 0.2, 0.2, 0.5, 0.03, 0.03])
         for it in items:
             self.items.append(it)
-        for _ in range(random.randint(20, 30)):
-            self.items.append(Coin(self.game, self.room))
-        for _ in range(random.randint(2, 7)):
-            self.items.append(Emerald(self.game, self.room))
-        for _ in range(random.randint(2, 7)):
-            self.items.append(Ruby(self.game, self.room))
+        for _ in range(rng.loot.randint(20, 30)):
+            self.items.append(pool.acquire(Coin, self.game, self.room))
+        for _ in range(rng.loot.randint(2, 7)):
+            self.items.append(pool.acquire(Emerald, self.game, self.room))
+        for _ in range(rng.loot.randint(2, 7)):
+            self.items.append(pool.acquire(Ruby, self.game, self.room))
 
     def load_image(self):
-        image = pygame.image.load('src/assets/objects/chest/full/chest_full0.png').convert_alpha()
-        image = pygame.transform.scale(image, self.size)
-        self.image = image
+        self.image = assets.image('src/assets/objects/chest/full/chest_full0.png', self.size)
 
     def chest_particles(self):
-        if random.randint(0, 30) == 5 and not self.open:
+        if rng.cosmetic.randint(0, 30) == 5 and not self.open:
             position = (self.rect.x + 0.5 * 64, self.rect.y)
-            self.game.particle_manager.add_particle(ChestParticle(self.game, *position, self))
+            self.game.particle_manager.add_particle(pool.acquire(ChestParticle, self.game, *position, self))
 
     def change_chest_state(self):
         if self.open and self.animation_frame <= 2:
             self.animation_frame += 1 / 20
-            self.image = pygame.image.load(
-                f'src/assets/objects/chest/full/chest_full{int(self.animation_frame)}.png').convert_alpha()
-            self.image = pygame.transform.scale(self.image, utils.basic_entity_size)
+            self.image = assets.image(f'src/assets/objects/chest/full/chest_full{int(self.animation_frame)}.png',
+                                      utils.basic_entity_size)
         elif 2 < self.animation_frame <= 3:
             self.animation_frame += 1 / 20
         elif self.open:
-            self.image = pygame.image.load(
-                'src/assets/objects/chest/empty/chest_empty2.png'
-            ).convert_alpha()
-            self.image = pygame.transform.scale(self.image, utils.basic_entity_size)
+            self.image = assets.image('src/assets/objects/chest/empty/chest_empty2.png', utils.basic_entity_size)
             self.drop_items()  # at the last frame of animation, drop items
             if self.play_sound:
-                self.game.sound_manager.play(pygame.mixer.Sound('src/assets/sound/Magic1.wav'))
+                self.game.sound_manager.play('magic')
                 self.play_sound = False
 
     def update(self):
@@ -81,12 +76,10 @@ class Chest(Object):
 
     def detect_collision(self):
         if self.game.player.hitbox.colliderect(self.rect):
-            self.image = pygame.image.load('c/assets/objects/chest/full/chest_picked.png').convert_alpha()
-            self.image = pygame.transform.scale(self.image, (64, 64))
+            self.image = assets.image('src/assets/objects/chest/full/chest_picked.png', (64, 64))
             self.interaction = True
         else:
-            self.image = pygame.image.load('./assets/objects/chest/full/chest_full0.png').convert_alpha()
-            self.image = pygame.transform.scale(self.image, utils.basic_entity_size)
+            self.image = assets.image('src/assets/objects/chest/full/chest_full0.png', utils.basic_entity_size)
             self.interaction = False
 
     def chest_collision(self):
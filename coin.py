@@ -1,36 +1,55 @@
 from object import Object
+from asset_manager import assets
+import utils as utils
 import pygame
-import random
+from random_manager import rng
+from pool import pool
 import math
 
 
 class Coin(Object):
+    __slots__ = ('images', 'animation_frame', 'base_hitbox')
     x = None
     y = None
-    name = 'coin'
-    object_type = 'coin'
-    size = (16, 16)
+    coin_name = 'coin'  # name and size are slots of Object, class attributes of the same name would hide them
+    coin_size = (16, 16)
+    coin_value = 1
 
     def __init__(self, game, room=None):
         self.images = []
-        Object.__init__(self, game, self.name, self.object_type, self.size, room)
+        Object.__init__(self, game, self.coin_name, 'coin', self.coin_size, room)
+        self.base_hitbox = self.hitbox.copy()  # mask bounds of the first frame at the origin, as reset places it
+        self.reset(game, room)
+
+    def reset(self, game, room=None):
+        """Puts a new or pooled coin in its undropped state, the images are kept and the helper objects reset"""
+        self.game = game
+        self.room = room
+        self.image = self.images[0]
+        self.rect.topleft = (0, 0)
+        self.hitbox = self.base_hitbox.copy()
+        self.interaction = False
+        self.for_sale = False
         self.dropped = False
         self.bounce = None
         self.animation_frame = 0
-        self.value = 1
+        self.value = self.coin_value
+        self.show_name.reset()
+        self.show_price.reset()
+        self.hovering.reset(game)
+        self.shadow.reset(game)
 
     def activate_bounce(self):
-        self.bounce = Bounce(self.rect.x, self.rect.y, self.rect.y + random.randint(0, 123), self.size)
+        self.bounce = Bounce(self.rect.x, self.rect.y, self.rect.y + rng.loot.randint(0, 123), self.size)
 
     def load_image(self):
+        image = assets.image(f'src/assets/objects/{self.name}/{self.name}.png', self.size)
         for i in range(4):
-            image = pygame.image.load(f'src/assets/objects//{self.name}/{self.name}.png').convert_alpha()
-            image = pygame.transform.scale(image, self.size)
             self.images.append(image)
         self.image = self.images[0]
 
     def update_animation_frame(self):
-        self.animation_frame += (1.5 + (random.randint(1, 5) / 10)) / 15  # random.randint(10, 20)/100
+        self.animation_frame += (1.5 + (rng.cosmetic.randint(1, 5) / 10)) / 15  # random.randint(10, 20)/100
         if self.animation_frame > 3:
             self.animation_frame = 0
         self.image = self.images[int(self.animation_frame)]
@@ -47,6 +66,10 @@ class Coin(Object):
             self.game.player.gold += self.value
             self.game.world_manager.current_room.objects.remove(self)
             self.play_sound()
+            pool.release(self)
+
+    def play_sound(self):
+        self.game.sound_manager.play('coin')
 
     def magnet(self):
         dir_vector = pygame.math.Vector2(self.game.player.hitbox.center[0] - self.rect.x,
@@ -62,10 +85,7 @@ class Coin(Object):
             self.rect.move_ip(*dir_vector)
 
     def draw_shadow(self, surface):
-        color = (0, 0, 0, 120)
-        shape_surf = pygame.Surface((50, 50), pygame.SRCALPHA).convert_alpha()
-        pygame.draw.ellipse(shape_surf, color, (0, 0, 5, 3))
-        shape_surf = pygame.transform.scale(shape_surf, (100, 100))
+        shape_surf = utils.shadow_sprite(50, (0, 0, 5, 3))
         surface.blit(shape_surf, (self.rect.x + 2, self.rect.y + 20))
 
     def draw(self):
@@ -74,35 +94,27 @@ class Coin(Object):
 
 
 class Emerald(Coin):
-    name = 'emerald'
-    object_type = 'coin'
-    size = (24, 24)
-
-    def __init__(self, game, room=None):
-        super().__init__(game, room)
-        self.value = 5
+    __slots__ = ()
+    coin_name = 'emerald'
+    coin_size = (24, 24)
+    coin_value = 5
 
 
 class Ruby(Coin):
-    name = 'ruby'
-    object_type = 'coin'
-    size = (24, 24)
-
-    def __init__(self, game, room=None):
-        super().__init__(game, room)
-        self.value = 15
-
-
-def play_sound():
-    pygame.mixer.Sound.play(pygame.mixer.Sound('src/assets/sound/Coin.wav'))
+    __slots__ = ()
+    coin_name = 'ruby'
+    coin_size = (24, 24)
+    coin_value = 15
 
 
 class Bounce:
+    __slots__ = ('speed', 'angle', 'drag', 'elasticity', 'gravity', 'limit', 'limits', 'x', 'y', 'size')
+
     def __init__(self, x, y, limit, size):
-        self.speed = random.uniform(0.5, 0.6)  # 0.5
-        self.angle = random.randint(-10, 10) / 10  # random.choice([10, -10])
+        self.speed = rng.loot.uniform(0.5, 0.6)  # 0.5
+        self.angle = rng.loot.randint(-10, 10) / 10  # random.choice([10, -10])
         self.drag = 0.999
-        self.elasticity = random.uniform(0.75, 0.9)  # 0.75
+        self.elasticity = rng.loot.uniform(0.75, 0.9)  # 0.75
         self.gravity = (math.pi, 0.002)
         self.limit = limit
         self.limits = [limit, 654]
@@ -147,6 +159,6 @@ class Bounce:
 
     def reset(self):
         self.speed = 0.5
-        self.angle = random.choice([10, -10])
+        self.angle = rng.loot.choice([10, -10])
         self.drag = 0.999
         self.elasticity = 0.75
\ No newline at end of file
@@ -0,0 +1,181 @@
+import random
+import struct
+import zlib
+import pygame
+from collections import namedtuple
+import utils as utils
+from random_manager import rng
+
+RecordedFrame = namedtuple('RecordedFrame', ['dt', 'ticks', 'mouse_pos', 'mouse_buttons', 'keys', 'events'])
+
+
+class KeyState:
+    """Pressed keys, indexable by pygame key constants like the sequence pygame.key.get_pressed() returns"""
+
+    def __init__(self, keys=()):
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+class LiveInput:
+    """Samples keyboard, mouse and the event queue from pygame once per frame"""
+    holds_clock = False  # live play reads the clock once per frame and holds it, see Game.run_game
+
+    def __init__(self):
+        self.events = []
+        self.pressed = KeyState()
+        self.mouse_pos = (0, 0)
+        self.mouse_buttons = (False, False, False)
+
+    def poll(self):
+        self.events = pygame.event.get()
+        self.pressed = pygame.key.get_pressed()
+        self.mouse_pos = pygame.mouse.get_pos()
+        self.mouse_buttons = pygame.mouse.get_pressed()
+
+    def frame_clock(self, frame, dt):
+        """(ticks in ms, dt in s) of a fixed timestep frame, replays return the recorded ones instead"""
+        return int(frame * dt * 1000), dt
+
+
+class ScriptedInput(LiveInput):
+    """Replays inputs from a script, a list of (keys, mouse_pos, mouse_buttons) frames that loops when it runs out,
+    or a callable taking the frame number and returning one. Events still come from the pygame queue."""
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = script
+        self.frame = 0
+
+    def sample(self, frame):
+        if callable(self.script):
+            return self.script(frame)
+        return self.script[frame % len(self.script)]
+
+    def poll(self):
+        self.events = pygame.event.get()
+        keys, self.mouse_pos, self.mouse_buttons = self.sample(self.frame)
+        self.pressed = KeyState(keys)
+        self.frame += 1
+
+
+class RandomInput(ScriptedInput):
+    """Random walk over WASD with random aiming and clicking, for soak and balance runs"""
+    movement_keys = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+
+    def __init__(self, seed=None, hold=20, click_chance=0.05):
+        super().__init__(self.random_frame)
+        self.random = random.Random(seed)
+        self.hold = hold  # frames a set of movement keys is held
+        self.click_chance = click_chance
+        self.held = set()
+
+    def random_frame(self, frame):
+        if frame % self.hold == 0:
+            self.held = {key for key in self.movement_keys if self.random.random() < 0.4}
+        mouse_pos = (self.random.randint(200, 1100), self.random.randint(150, 650))
+        click = self.random.random() < self.click_chance
+        return self.held, mouse_pos, (click, False, False)
+
+
+class InputRecorder(LiveInput):
+    """Passes another input source through and records what the game sampled every frame, see save"""
+    tracked_keys = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_e, pygame.K_q, pygame.K_TAB,
+                    pygame.K_ESCAPE)  # keys read by Player.input and Game.input
+    tracked_events = (pygame.USEREVENT, pygame.MOUSEBUTTONDOWN)
+    holds_clock = True  # the frame sees the same ticks and dt the replay will feed back
+
+    def __init__(self, source=None, game=None):
+        super().__init__()
+        self.source = source or LiveInput()
+        self.game = game  # frame dt is read from it
+        self.seed = None
+        self.frames = []
+
+    def poll(self):
+        source = self.source
+        source.poll()
+        self.events, self.pressed = source.events, source.pressed
+        self.mouse_pos, self.mouse_buttons = source.mouse_pos, source.mouse_buttons
+        if self.seed is None:  # the seed the recorded run was generated from
+            self.seed = rng.seed_value
+        keys = [key for key in self.tracked_keys if self.pressed[key]]
+        events = [(event.type, getattr(event, 'button', 0)) for event in self.events
+                  if event.type in self.tracked_events]
+        self.frames.append(RecordedFrame(self.game.dt, utils.get_ticks(), self.mouse_pos, self.mouse_buttons,  # held
+                                         keys, events))
+
+    def save(self, path):
+        save_recording(path, self.seed, self.tracked_keys, self.frames)
+
+
+class ReplayInput(ScriptedInput):
+    """Feeds a recording back frame by frame, with its recorded events, ticks and dt"""
+
+    def __init__(self, path):
+        self.seed, self.recorded = load_recording(path)
+        super().__init__(self.recorded)
+
+    def __len__(self):
+        return len(self.recorded)
+
+    def poll(self):
+        self.events = [event for event in pygame.event.get() if event.type == pygame.QUIT]  # live input is ignored
+        frame = self.recorded[self.frame]
+        for event_type, button in frame.events:
+            event = pygame.event.Event(event_type, button=button) if button else pygame.event.Event(event_type)
+            self.events.append(event)
+        self.pressed = KeyState(frame.keys)
+        self.mouse_pos, self.mouse_buttons = frame.mouse_pos, frame.mouse_buttons
+        self.frame += 1
+
+    def frame_clock(self, frame, dt):
+        return self.recorded[frame].ticks, self.recorded[frame].dt
+
+
+# recording file: zlib compressed header, tracked key codes, then one fixed size record per frame followed by its
+# events; pressed keys are a bit mask over the tracked keys and mouse buttons a 3 bit mask
+recording_magic = b'CPIR'
+recording_version = 2
+recording_header = struct.Struct('<4sBIB')  # magic, version, seed, number of tracked keys
+recording_frame = struct.Struct('<dIhhBHB')  # dt, ticks, mouse x, mouse y, buttons, keys, number of events
+recording_frames = {1: struct.Struct('<fIhhBHB'), 2: recording_frame}  # version 1 rounded dt to a float
+recording_event = struct.Struct('<IB')  # type, mouse button
+
+
+def save_recording(path, seed, tracked_keys, frames):
+    data = [recording_header.pack(recording_magic, recording_version, seed, len(tracked_keys)),
+            struct.pack(f'<{len(tracked_keys)}I', *tracked_keys)]
+    for frame in frames:
+        buttons = sum(1 << i for i, pressed in enumerate(frame.mouse_buttons[:3]) if pressed)
+        keys = sum(1 << tracked_keys.index(key) for key in frame.keys)
+        data.append(recording_frame.pack(frame.dt, frame.ticks, *frame.mouse_pos, buttons, keys, len(frame.events)))
+        data.extend(recording_event.pack(*event) for event in frame.events)
+    with open(path, 'wb') as f:
+        f.write(zlib.compress(b''.join(data)))
+
+
+def load_recording(path):
+    """Returns (seed, list of RecordedFrame)"""
+    with open(path, 'rb') as f:
+        data = zlib.decompress(f.read())
+    magic, version, seed, key_count = recording_header.unpack_from(data)
+    if magic != recording_magic or version not in recording_frames:
+        raise ValueError(f'{path} is not an input recording')
+    frame_struct = recording_frames[version]
+    offset = recording_header.size
+    tracked_keys = struct.unpack_from(f'<{key_count}I', data, offset)
+    offset += 4 * key_count
+    frames = []
+    while offset < len(data):
+        dt, ticks, x, y, buttons, keys, event_count = frame_struct.unpack_from(data, offset)
+        offset += frame_struct.size
+        events = []
+        for _ in range(event_count):
+            events.append(recording_event.unpack_from(data, offset))
+            offset += recording_event.size
+        frames.append(RecordedFrame(dt, ticks, (x, y), tuple(bool(buttons >> i & 1) for i in range(3)),
+                                    [key for i, key in enumerate(tracked_keys) if keys >> i & 1], events))
+    return seed, frames
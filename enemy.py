@@ -1,14 +1,15 @@
 import pygame
-import random
+from random_manager import rng
 from particles import DeathAnimation
 from entity import Entity
 from weapon import ImpBullet
 from coin import Coin
-from utils import time_passed
+from pool import pool
+from utils import time_passed, mark_dirty, get_ticks
 
 
 def draw_health_bar(surf, pos, size, border_c, back_c, health_c, progress):
-    pygame.draw.rect(surf, back_c, (*pos, *size))
+    mark_dirty(surf, pygame.draw.rect(surf, back_c, (*pos, *size)))
     pygame.draw.rect(surf, border_c, (*pos, *size), 1)
     inner_pos = (pos[0] + 1, pos[1] + 1)
     inner_size = ((size[0] - 2) * progress, size[1] - 2)
@@ -17,6 +18,10 @@ def draw_health_bar(surf, pos, size, border_c, back_c, health_c, progress):
 
 
 class Enemy(Entity):
+    pathfinding = True  # chase along the room's flow field around walls instead of in a straight line
+    flee_radius = 100  # runs from a player closer than this
+    roam_area = (196, 162, 1082, 586)  # left, top, right, bottom of the spots pick_random_spot picks from
+
     def __init__(self, game, max_hp, room, name):
         Entity.__init__(self, game, name)
         self.max_hp = max_hp  # maximum hp
@@ -30,10 +35,11 @@ class Enemy(Entity):
         self.items = []
         self.add_treasure()
         self.destination_position = None
+        self.steered = None  # this tick's direction or False to keep the velocity, see EnemyManager.steer
 
     def add_treasure(self):
-        for _ in range(random.randint(5, 10)):
-            self.items.append(Coin(self.game, self.room))
+        for _ in range(rng.loot.randint(5, 10)):
+            self.items.append(pool.acquire(Coin, self.game, self.room))
 
     def drop_items(self):
         self.game.sound_manager.play_drop_items_sound()
@@ -47,12 +53,12 @@ class Enemy(Entity):
             self.items.remove(item)
 
     def spawn(self):
-        self.rect.x = random.randint(200, 1000)
-        self.rect.y = random.randint(250, 600)
+        self.rect.x = rng.worldgen.randint(200, 1000)
+        self.rect.y = rng.worldgen.randint(250, 600)
 
     def can_attack(self):
         if time_passed(self.attack_cooldown, 1000):
-            self.attack_cooldown = pygame.time.get_ticks()
+            self.attack_cooldown = get_ticks()
             return True
 
     def can_get_hurt_from_weapon(self):
@@ -73,29 +79,65 @@ class Enemy(Entity):
 
     def change_speed(self):  # changes speed every 1.5s
         if time_passed(self.move_time, 1500):
-            self.move_time = pygame.time.get_ticks()
-            self.speed = random.randint(250, 300)
+            self.move_time = get_ticks()
+            self.speed = rng.ai.randint(250, 300)
             return True
 
     def move(self):
         if not self.dead and self.hp > 0 and self.can_move and not self.game.player.dead:
             if self.game.player.death_counter != 0:
                 self.move_towards_player()
+                self.wall_collision()
             else:
-                self.move_away_from_player(radius=100)
+                self.move_away_from_player(radius=self.flee_radius)
         else:
             self.velocity = [0, 0]
 
+    def steering(self):
+        """'seek' or 'flee' when move will chase or run from the player this tick, None when it does neither"""
+        if not self.dead and self.hp > 0 and self.can_move and not self.game.player.dead:
+            return 'seek' if self.game.player.death_counter != 0 else 'flee'
+        return None
+
+    def take_steering(self):
+        """Moves along the direction EnemyManager.steer left for this tick, if any, at the enemy's current speed"""
+        if self.steered is None:
+            return False
+        if self.steered:
+            step = self.speed * self.game.dt
+            self.set_velocity([self.steered[0] * step, self.steered[1] * step])
+        self.steered = None
+        return True
+
+    def wall_collision(self):
+        """Like Entity.wall_collision, but keeps the part of the move along the wall so corners do not stop it"""
+        for velocity in (self.velocity, (self.velocity[0], 0), (0, self.velocity[1])):
+            test_rect = self.hitbox.move(*velocity)
+            collide_points = (test_rect.midbottom, test_rect.bottomleft, test_rect.bottomright)
+            if not self.game.world_manager.current_map.wall_collision(collide_points):
+                self.velocity = list(velocity)
+                return
+        self.velocity = [0, 0]
+
     def move_towards_player(self):
+        if self.take_steering():
+            return
         dt = self.game.dt
-        dir_vector = pygame.math.Vector2(self.game.player.hitbox.x - self.hitbox.x,
-                                         self.game.player.hitbox.y - self.hitbox.y)
+        waypoint = self.pathfinding and self.room.tile_map.flow_field.waypoint(self.hitbox.midbottom)
+        if waypoint:  # None in the player's own cell, from there it is a straight line
+            dir_vector = pygame.math.Vector2(waypoint[0] - self.hitbox.midbottom[0],
+                                             waypoint[1] - self.hitbox.midbottom[1])
+        else:
+            dir_vector = pygame.math.Vector2(self.game.player.hitbox.x - self.hitbox.x,
+                                             self.game.player.hitbox.y - self.hitbox.y)
         if dir_vector.length_squared() > 0:  # cant normalize vector of length 0
             dir_vector.normalize_ip()
             dir_vector.scale_to_length(self.speed * dt)
         self.set_velocity(dir_vector)
 
     def move_away_from_player(self, radius):
+        if self.take_steering():
+            return
         dt = self.game.dt
         distance_to_player = pygame.math.Vector2(self.game.player.hitbox.x - self.hitbox.x,
                                                  self.game.player.hitbox.y - self.hitbox.y).length()
@@ -119,13 +161,12 @@ class Enemy(Entity):
             self.set_velocity([0, 0])
 
     def pick_random_spot(self):
-        min_x, max_x = 196, 1082
-        min_y, max_y = 162, 586
-        pick = [random.randint(min_x, max_x), random.randint(min_y, max_y)]
+        min_x, min_y, max_x, max_y = self.roam_area
+        pick = [rng.ai.randint(min_x, max_x), rng.ai.randint(min_y, max_y)]
         vector = pygame.math.Vector2(self.game.player.hitbox.x - pick[0],
                                      self.game.player.hitbox.y - pick[1])
         while vector.length() < 100:
-            pick = [random.randint(min_x, max_x), random.randint(min_y, max_y)]
+            pick = [rng.ai.randint(min_x, max_x), rng.ai.randint(min_y, max_y)]
             vector = pygame.math.Vector2(self.game.player.hitbox.x - pick[0],
                                          self.game.player.hitbox.y - pick[1])
         self.destination_position = pick
@@ -147,6 +188,7 @@ class Imp(Enemy):
     damage = 5
     name = 'bat'
     speed = 200
+    flee_radius = 300
 
     def __init__(self, game, speed, max_hp, room, ):
         Enemy.__init__(self, game, max_hp, room, self.name)
@@ -155,11 +197,11 @@ class Imp(Enemy):
 
     def shoot(self):
         if not sum(self.velocity) and time_passed(self.time, 750) and self.game.player.dead is False and not self.dead:
-            self.time = pygame.time.get_ticks()
+            self.time = get_ticks()
             self.game.bullet_manager.add_bullet(
-                ImpBullet(self.game, self, self.room, self.hitbox.midbottom[0], self.hitbox.midbottom[1],
-                          self.game.player.hitbox.midbottom))
-            self.game.sound_manager.play(pygame.mixer.Sound('src/assets/sound/Shoot5.wav'))
+                pool.acquire(ImpBullet, self.game, self, self.room, self.hitbox.midbottom[0],
+                             self.hitbox.midbottom[1], self.game.player.hitbox.midbottom))
+            self.game.sound_manager.play('shoot')
 
     def update(self):
         self.move()
@@ -168,4 +210,7 @@ class Imp(Enemy):
 
     def move(self):
         if not self.dead and self.hp > 0:
-            self.move_away_from_player(radius=300)
\ No newline at end of file
+            self.move_away_from_player(radius=self.flee_radius)
+
+    def steering(self):
+        return 'flee' if not self.dead and self.hp > 0 else None
\ No newline at end of file
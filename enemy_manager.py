@@ -1,14 +1,22 @@
 import pygame
-import random
+import numpy
+from random_manager import rng
 from map_generator import Room
 from enemy import Imp, Enemy
+from spatial_hash import SpatialHash
 
 
 
 class EnemyManager:
+    batched = False  # steer the enemies using the stock moves in one NumPy pass instead of one by one, see steer
+    steered_moves = (Enemy.move, Imp.move)  # moves steer knows, enemies with their own keep steering themselves
+    separation_radius = 48  # batched steering pushes moving enemies closer than this apart, in pixels
+    separation = 1  # weight of that push against the direction the enemy wants to go
+
     def __init__(self, game):
         self.game = game
         self.enemy_list = []
+        self.enemy_hash = SpatialHash()  # broadphase for bullet and weapon hits, rebuilt every tick
         self.damage_multiplier = 1
         self.health_multiplier = 1
 
@@ -24,12 +32,121 @@ class EnemyManager:
         for enemy in self.game.world_manager.current_room.enemy_list:
             self.enemy_list.append(enemy)
 
+    def update_enemy_hash(self):
+        self.enemy_hash.clear()
+        for enemy in self.enemy_list:
+            self.enemy_hash.insert(enemy, enemy.rect.union(enemy.hitbox))
+
+    def enemies_near(self, rect):
+        """Enemies from enemy_list whose rect or hitbox may overlap rect, in enemy_list order"""
+        return self.enemy_hash.query(rect)
+
+    def update_flow_field(self):
+        """Points the current room's flow field at the player, a no-op until the player enters another cell"""
+        if self.enemy_list:
+            self.game.world_manager.current_map.flow_field.update(self.game.player.hitbox.midbottom)
+
     def update_enemies(self):
         self.set_enemy_list()
+        self.update_flow_field()
+        if self.batched:
+            self.steer()
         for enemy in self.game.world_manager.current_room.enemy_list:
             enemy.update()
+        self.update_enemy_hash()
         self.debug()
 
+    def steer(self):
+        """Works out this tick's direction of every enemy using a stock move at once and leaves it in enemy.steered,
+        where move_towards_player and move_away_from_player pick it up instead of steering themselves and scale it by
+        the speed the enemy has by then, after change_speed in Enemy.update. Seek, flee
+        and destination picking follow the per-enemy code, new destinations come from the ai numpy stream. Moving
+        enemies are also pushed apart, which per-enemy steering does not do. An enemy that moves after
+        basic_update is steered from where it stood before basic_update moved it this tick."""
+        enemies, rows = [], []
+        for enemy in self.enemy_list:
+            enemy.steered = None  # not picked up last tick if the enemy died in basic_update
+            mode = type(enemy).move in self.steered_moves and enemy.steering()
+            if mode:
+                hitbox = enemy.hitbox
+                enemies.append(enemy)
+                rows.append((hitbox.x, hitbox.y, hitbox.centerx, hitbox.bottom, enemy.flee_radius,
+                             *(enemy.destination_position or (numpy.nan, numpy.nan)), mode == 'seek',
+                             enemy.pathfinding))
+        if not enemies:
+            return
+        x, y, foot_x, foot_y, radius, goal_x, goal_y, seek, path = numpy.array(rows, dtype=float).T
+        seek = seek > 0
+        player = self.game.player.hitbox
+        dx, dy = player.x - x, player.y - y
+        keep = numpy.zeros(len(enemies), dtype=bool)  # velocity stays as it was
+
+        path = seek & (path > 0)
+        if path.any():
+            wx, wy = self.game.world_manager.current_map.flow_field.waypoints(foot_x[path], foot_y[path])
+            found = ~numpy.isnan(wx)
+            chasing = numpy.flatnonzero(path)[found]
+            dx[chasing], dy[chasing] = wx[found] - foot_x[chasing], wy[found] - foot_y[chasing]
+
+        flee = ~seek
+        destinations = {}  # row -> destination picked this tick
+        if flee.any():
+            has = ~numpy.isnan(goal_x)
+            destination = numpy.column_stack((goal_x, goal_y))
+            near = numpy.hypot(dx, dy) < radius
+            # a destination the player came close to is replaced, a fleeing enemy without one gets one
+            pick = flee & ((has & (numpy.hypot(player.x - goal_x, player.y - goal_y) < radius)) | (near & ~has))
+            destination[pick] = self.pick_spots(numpy.count_nonzero(pick))
+            destinations.update(zip(numpy.flatnonzero(pick).tolist(), destination[pick]))
+            fleeing = flee & near
+            dx[fleeing], dy[fleeing] = destination[fleeing, 0] - x[fleeing], destination[fleeing, 1] - y[fleeing]
+            arrived = fleeing & (dx == 0) & (dy == 0)  # standing on the spot, a new one is picked for next tick
+            destination[arrived] = self.pick_spots(numpy.count_nonzero(arrived))
+            destinations.update(zip(numpy.flatnonzero(arrived).tolist(), destination[arrived]))
+            keep |= arrived
+            dx[flee & ~near], dy[flee & ~near] = 0, 0
+
+        length = numpy.hypot(dx, dy)
+        moving = (length > 0) & ~keep
+        ux = numpy.divide(dx, length, out=numpy.zeros_like(dx), where=moving)
+        uy = numpy.divide(dy, length, out=numpy.zeros_like(dy), where=moving)
+        movers = numpy.flatnonzero(moving)
+        if self.separation and len(movers) and len(enemies) > 1:
+            ox, oy = x[movers, None] - x, y[movers, None] - y  # from every enemy to each moving one
+            squared = ox * ox + oy * oy
+            mover, other = numpy.nonzero((squared > 0) & (squared < self.separation_radius ** 2))
+            if len(mover):
+                # unit vectors away from each close enemy, weighted up to 1 as the gap closes
+                distance = numpy.sqrt(squared[mover, other])
+                weight = (1 - distance / self.separation_radius) / distance * self.separation
+                sx = ux[movers] + numpy.bincount(mover, ox[mover, other] * weight, len(movers))
+                sy = uy[movers] + numpy.bincount(mover, oy[mover, other] * weight, len(movers))
+                turned = numpy.hypot(sx, sy)
+                apart = turned > 0
+                ux[movers[apart]], uy[movers[apart]] = sx[apart] / turned[apart], sy[apart] / turned[apart]
+
+        for enemy, direction_x, direction_y in zip(enemies, ux.tolist(), uy.tolist()):
+            enemy.steered = [direction_x, direction_y]
+        for row in numpy.flatnonzero(keep).tolist():
+            enemies[row].steered = False
+        for row, destination in destinations.items():
+            enemies[row].destination_position = [int(value) for value in destination]
+
+    def pick_spots(self, count):
+        """count spots like Enemy.pick_random_spot picks them, at least 100 pixels from the player"""
+        left, top, right, bottom = Enemy.roam_area
+        player = self.game.player.hitbox
+        generator = rng.numpy_stream('ai')
+        spots = numpy.zeros((count, 2))
+        missing = numpy.arange(count)
+        while len(missing):  # rejection sampling, one round is usually enough
+            spot_x = generator.integers(left, right + 1, len(missing))
+            spot_y = generator.integers(top, bottom + 1, len(missing))
+            clear = numpy.hypot(player.x - spot_x, player.y - spot_y) >= 100
+            spots[missing[clear], 0], spots[missing[clear], 1] = spot_x[clear], spot_y[clear]
+            missing = missing[~clear]
+        return spots
+
     def add_enemies(self):
         for row in self.game.world_manager.world.world:
             for room in row:
@@ -49,16 +166,16 @@ class EnemyManager:
 
     def add_normal_enemies(self, room):
         level = self.game.world_manager.level
-        num_of_demons = random.randint(1 + level, 4 + level)
-        num_of_imps = random.randint(0 + level, 4 + level)
+        num_of_demons = rng.worldgen.randint(1 + level, 4 + level)
+        num_of_imps = rng.worldgen.randint(0 + level, 4 + level)
         for _ in range(num_of_imps):
-            room.enemy_list.append(Imp(self.game, random.randint(100, 150) / 10, 100, room))
+            room.enemy_list.append(Imp(self.game, rng.worldgen.randint(100, 150) / 10, 100, room))
             self.upgrade_enemy(room.enemy_list[-1])
             room.enemy_list[-1].spawn()
 
     def debug(self):
-        if pygame.mouse.get_pressed()[2]:
-            mx, my = pygame.mouse.get_pos()
+        if self.game.controls.mouse_buttons[2]:
+            mx, my = self.game.controls.mouse_pos
             mx -= 64  # because we are rendering player on map_surface
             my -= 32
             self.game.world_manager.current_room.enemy_list.append(
@@ -1,7 +1,9 @@
+import os
 import pygame
 import utils as utils
 from utils import get_mask_rect
 from particles import DeathAnimation
+from asset_manager import assets
 
 
 def load_animation_sprites(path, size=utils.basic_entity_size):
@@ -13,9 +15,7 @@ def load_animation_sprites(path, size=utils.basic_entity_size):
         sub_states = os.listdir(path + state)
         for sub_state in sub_states:
             key = state.upper()  # key to dictionary
-            animation_image = pygame.image.load(path + state + '/' + sub_state).convert_alpha()
-            animation_image = pygame.transform.scale(animation_image, size)
-            animation_data[key].append(animation_image)
+            animation_data[key].append(assets.image(path + state + '/' + sub_state, size))
     return animation_data
 
 class Entity:
@@ -23,11 +23,12 @@ class Entity:
         self.game = game
         self.name = name
         self.path = f'src/assets/characters/{self.name}'
-        self.image = pygame.transform.scale(pygame.image.load(f'{self.path}/{self.name}.png'), utils.basic_entity_size).convert_alpha()
+        self.image = assets.image(f'{self.path}/{self.name}.png', utils.basic_entity_size)
         self.rect = self.image.get_rect()
         self.hitbox = get_mask_rect(self.image, *self.rect.topleft)
         self.velocity = [0, 0]
         self.hurt = False
+        self.hurt_timer = 0  # ticks of the last hit taken
         self.dead = False
         self.direction = 'right'
         self.can_move = True
@@ -68,21 +69,17 @@ class Entity:
     def wall_collision(self):
         test_rect = self.hitbox.move(*self.velocity)  # Position after moving, change name later
         collide_points = (test_rect.midbottom, test_rect.bottomleft, test_rect.bottomright)
-        for wall in self.game.world_manager.current_map.wall_list:
-            if any(wall.hitbox.collidepoint(point) for point in collide_points):
-                self.velocity = [0, 0]
+        if self.game.world_manager.current_map.wall_collision(collide_points):
+            self.velocity = [0, 0]
 
     def update_hitbox(self):
-        self.hitbox = get_mask_rect(self.image, *self.rect.topleft)
+        self.hitbox = assets.mask_rect(self.image, *self.rect.topleft)  # every frame for every entity
         self.hitbox.midbottom = self.rect.midbottom
 
     def moving(self):
         return self.velocity[0] != 0 or self.velocity[1] != 0
 
     def draw_shadow(self, surface, dimension=50, size=(0, 0, 15, 7), vertical_shift=-5, horizontal_shift=-1):
-        color = (0, 0, 0, 120)
-        shape_surf = pygame.Surface((dimension, dimension), pygame.SRCALPHA).convert_alpha()
-        pygame.draw.ellipse(shape_surf, color, size)
-        shape_surf = pygame.transform.scale(shape_surf, (2 * dimension, 2 * dimension))
+        shape_surf = utils.shadow_sprite(dimension, size)
         position = [self.hitbox.bottomleft[0] + horizontal_shift, self.hitbox.bottomleft[1] + vertical_shift]
         surface.blit(shape_surf, position)
\ No newline at end of file
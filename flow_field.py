@@ -0,0 +1,108 @@
+from collections import deque
+import numpy
+
+# (column, row) offsets to the 8 neighbours of a cell and the cost of moving there
+NEIGHBOURS = ((1, 0, 2), (-1, 0, 2), (0, 1, 2), (0, -1, 2), (1, 1, 3), (1, -1, 3), (-1, 1, 3), (-1, -1, 3))
+
+
+class FlowField:
+    """Distances from the player's tile cell to every cell of a TileMap around its walls, and for each cell the
+    neighbour to walk to next, so chasing enemies path around walls and read their direction with one lookup.
+
+    Cells are the ones of TileMap.wall_grid, a cell holding any wall hitbox is blocked. The field is rebuilt only
+    when the target moves to another cell, a room is a few hundred cells so a rebuild is a fraction of a ms."""
+
+    def __init__(self, tile_map):
+        self.tile_map = tile_map
+        self.columns, self.rows = tile_map.grid_size
+        self.blocked = set(tile_map.wall_grid)
+        self.links = None  # cell -> [(neighbour, cost)], worked out on the first rebuild, walls never change
+        self.target = None  # cell the field leads to
+        self.distance = {}  # cell -> cost of the shortest path to target, straight steps cost 2 and diagonal 3
+        self.next_cell = {}  # cell -> neighbour one step closer to target
+        self.grid = None  # waypoint of every cell as a (columns, rows, 2) array, NaN where none, see waypoints
+
+    def open(self, cell):
+        column, row = cell
+        return 0 <= column < self.columns and 0 <= row < self.rows and cell not in self.blocked
+
+    def steps(self, cell):
+        """Neighbours reachable from cell, diagonals only when both cells beside the step are open"""
+        column, row = cell
+        for dx, dy, cost in NEIGHBOURS:
+            neighbour = (column + dx, row + dy)
+            if not self.open(neighbour):
+                continue
+            if dx and dy and not (self.open((column + dx, row)) and self.open((column, row + dy))):
+                continue
+            yield neighbour, cost
+
+    def update(self, point):
+        """Rebuilds the field if point is in another cell than the current target"""
+        cell = self.tile_map.get_cell(*point)
+        if cell == self.target:
+            return False
+        self.target = cell
+        self.rebuild()
+        return True
+
+    def rebuild(self):
+        if self.links is None:  # most rooms never see an enemy chase, keeps building the floor cheap
+            self.links = {(column, row): list(self.steps((column, row)))
+                          for column in range(self.columns) for row in range(self.rows)}
+        # Dial's algorithm, costs are small integers so a bucket queue replaces the heap of Dijkstra
+        distance = {self.target: 0}
+        buckets = [deque([self.target])]
+        cost = 0
+        while cost < len(buckets):
+            bucket = buckets[cost]
+            while bucket:
+                cell = bucket.popleft()
+                if distance[cell] != cost:
+                    continue  # reached again later through a cheaper path
+                for neighbour, step in self.links.get(cell, ()):  # the player may stand in a door past the grid
+                    new = cost + step
+                    if new < distance.get(neighbour, new + 1):
+                        distance[neighbour] = new
+                        while len(buckets) <= new:
+                            buckets.append(deque())
+                        buckets[new].append(neighbour)
+            cost += 1
+        self.distance = distance
+        self.next_cell = {}
+        self.grid = None
+        target_column, target_row = self.target
+        for (column, row), links in self.links.items():
+            best, best_key = None, None
+            for neighbour, _ in links:
+                if neighbour not in distance:
+                    continue
+                # among equally close neighbours prefer the one most in line with the target
+                heading = (neighbour[0] - column) * (target_column - column) + (neighbour[1] - row) * (target_row - row)
+                key = (distance[neighbour], -heading)
+                if best_key is None or key < best_key:
+                    best, best_key = neighbour, key
+            if best is not None and best_key[0] < distance.get((column, row), best_key[0] + 1):
+                self.next_cell[column, row] = best  # blocked cells point out of the wall as well
+
+    def waypoint(self, point):
+        """Centre of the cell to walk towards from point, None once point is in the target cell or cannot reach it"""
+        cell = self.next_cell.get(self.tile_map.get_cell(*point))
+        if cell is None:
+            return None
+        size = self.tile_map.tile_size
+        return (cell[0] + 1.5) * size, (cell[1] + 1) * size
+
+    def waypoints(self, x, y):
+        """waypoint for arrays of points, returns arrays of waypoint x and y, NaN where waypoint gives None"""
+        size = self.tile_map.tile_size
+        if self.grid is None:
+            self.grid = numpy.full((self.columns, self.rows, 2), numpy.nan)
+            for cell, (column, row) in self.next_cell.items():
+                self.grid[cell] = (column + 1.5) * size, (row + 1) * size
+        column = numpy.floor((x - size) / size).astype(int)
+        row = numpy.floor((y - size / 2) / size).astype(int)
+        inside = (column >= 0) & (column < self.columns) & (row >= 0) & (row < self.rows)
+        found = numpy.full((len(column), 2), numpy.nan)
+        found[inside] = self.grid[column[inside], row[inside]]
+        return found[:, 0], found[:, 1]
@@ -10,74 +10,141 @@ from object_manager import ObjectManager
 from enemy_manager import EnemyManager
 from game_over import GameOver
 from player import Player
+from weapon import BulletManager
+from map import DirtySurface
+from asset_manager import assets
+from sound_manager import SoundManager
+from controls import LiveInput
+from random_manager import rng
+from profiler import Profiler, ProfilerOverlay
+import utils as utils
 import time
 pygame.init()
-pygame.mixer.init()
 
 world_size = (21 * 64, 14 * 64)
 
 
 
 class Game:
-    def __init__(self):
+    dirty_rendering = False  # push only the changed screen regions to the display instead of flipping it
+
+    def __init__(self, headless=False, controls=None, seed=None):
+        self.headless = headless  # no window, sound or menu, see run_headless
+        self.seed = seed  # None picks a new dungeon on every refresh, the seed in use is rng.seed_value
+        rng.seed(seed)
+        if headless:
+            pygame.mixer.quit()
+        elif not pygame.mixer.get_init():
+            pygame.mixer.init()
+        self.controls = controls or LiveInput()
         self.display = pygame.display.set_mode(world_size)
-        self.screen = pygame.Surface(world_size).convert()
+        if self.dirty_rendering:
+            self.screen = DirtySurface(world_size, self.display)
+        else:
+            self.screen = pygame.Surface(world_size).convert()
+        self.preload_assets()
         self.clock = pygame.time.Clock()
+        self.sound_manager = SoundManager(self)
+        self.sound_manager.preload()
         self.particle_manager = ParticleManager(self)
         self.world_manager = WorldManager(self)
         self.enemy_manager = EnemyManager(self)
+        self.bullet_manager = BulletManager(self)
         self.object_manager = ObjectManager(self)
         self.player = Player(self)
         self.running = True
         self.menu = MainMenu(self)
+        if headless:
+            self.menu.running = False
+            pygame.time.set_timer(pygame.USEREVENT, 0)  # hover ticks are posted in simulated time instead
         self.mini_map = MiniMap(self)
         self.game_time = None
         self.fps = 60
         self.background = BackgroundEffects()
         self.game_over = GameOver(self)
-        pygame.mixer.init()
         self.dt = 0
         self.screen_position = (0, 0)
+        self.full_redraw = True  # next present() updates the whole display
+        self.presented_map = None
+        self.profiler = Profiler()
+        self.profiler_overlay = ProfilerOverlay(self)
+
+    @staticmethod
+    def preload_assets():
+        """Loads sprites that are spawned in bursts (coins, chest frames) before the first frame"""
+        assets.preload(['src/assets/objects/coin/coin.png'], (16, 16))
+        assets.preload(['src/assets/objects/coin/coin.png'], (24, 24))
+        assets.preload([f'src/assets/objects/chest/full/chest_full{i}.png' for i in range(3)], (64, 64))
+        assets.preload(['src/assets/objects/chest/full/chest_picked.png'], (64, 64))
 
     def refresh(self):
-        pygame.mixer.Sound.stop(self.sound)
-        self.__init__()
+        self.sound_manager.stop()
+        self.world_manager.cancel_next_level()  # the new game plans its own
+        self.__init__(self.headless, self.controls, self.seed)
         pygame.display.flip()
         self.run_game()
 
     def update_groups(self):
-        self.enemy_manager.update_enemies()
-        self.object_manager.update()
-        self.player.update()
-        self.particle_manager.update_particles()
-        self.particle_manager.update_fire_particles()
-        self.background.update()
-        self.world_manager.update()
-        self.game_over.update()
-        self.mini_map.update()
+        scope = self.profiler.scope
+        with scope('enemy_manager.update_enemies'):
+            self.enemy_manager.update_enemies()
+        with scope('bullet_manager.update'):
+            self.bullet_manager.update()
+        with scope('object_manager.update'):
+            self.object_manager.update()
+        with scope('player.update'):
+            self.player.update()
+        with scope('particle_manager.update_particles'):
+            self.particle_manager.update_particles()
+        with scope('particle_manager.update_fire_particles'):
+            self.particle_manager.update_fire_particles()
+        with scope('background.update'):
+            self.background.update()
+        with scope('world_manager.update'):
+            self.world_manager.update()
+        with scope('game_over.update'):
+            self.game_over.update()
+        with scope('mini_map.update'):
+            self.mini_map.update()
 
     def draw_groups(self):
-        self.background.draw(self.screen)
-        self.world_manager.draw_map(self.screen)
-        if self.player:
-            self.player.draw(self.screen)
-        self.enemy_manager.draw_enemies(self.screen)
-        self.object_manager.draw()
-        self.mini_map.draw(self.screen)
-        self.particle_manager.draw_particles(self.world_manager.current_map.map_surface)
-        self.particle_manager.draw_fire_particles()
-        self.game_over.draw()
+        scope = self.profiler.scope
+        with scope('background.draw'):
+            self.background.draw(self.screen)
+        with scope('world_manager.draw_map'):
+            self.world_manager.draw_map(self.screen)
+        with scope('player.draw'):
+            if self.player:
+                self.player.draw(self.screen)
+        with scope('enemy_manager.draw_enemies'):
+            self.enemy_manager.draw_enemies(self.screen)
+        with scope('bullet_manager.draw'):
+            self.bullet_manager.draw()
+        with scope('object_manager.draw'):
+            self.object_manager.draw()
+        with scope('mini_map.draw'):
+            self.mini_map.draw(self.screen)
+        with scope('particle_manager.draw_particles'):
+            self.particle_manager.draw_particles(self.world_manager.current_map.map_surface)
+        with scope('particle_manager.draw_fire_particles'):
+            self.particle_manager.draw_fire_particles()
+        with scope('game_over.draw'):
+            self.game_over.draw()
+        self.profiler_overlay.draw(self.screen)
 
     def input(self):
-        for event in pygame.event.get():
+        self.controls.poll()
+        for event in self.controls.events:
             if event.type == pygame.QUIT:
                 pygame.quit()
             if event.type == pygame.USEREVENT:
                 self.object_manager.up += 1
                 self.object_manager.hover = True
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler_overlay.toggle()
 
         self.player.input()
-        pressed = pygame.key.get_pressed()
+        pressed = self.controls.pressed
         # if pressed[pygame.K_r]:
         #     self.refresh()
 
@@ -87,21 +154,91 @@ class Game:
             self.menu.running = True
             self.menu.play_button.clicked = False
 
+    def needs_full_redraw(self):
+        world_manager = self.world_manager
+        return (
+                self.full_redraw
+                or self.screen_position != (0, 0)
+                or world_manager.switch_room
+                or world_manager.new_level
+                or world_manager.move_current_room
+                or world_manager.current_map is not self.presented_map
+        )
+
+    def present(self):
+        if not self.dirty_rendering or self.needs_full_redraw():
+            self.display.blit(self.screen, self.screen_position)
+            pygame.display.flip()
+        else:
+            rects = self.screen.dirty_rects + self.screen.restored_rects  # drawn now + drawn last frame
+            for rect in rects:
+                self.display.blit(self.screen, rect, rect)
+            pygame.display.update(rects)
+        if self.dirty_rendering:
+            self.screen.restored_rects = self.screen.dirty_rects
+            self.screen.dirty_rects = []
+        self.full_redraw = False
+        self.presented_map = self.world_manager.current_map
+
     def run_game(self):
         self.enemy_manager.add_enemies()
         prev_time = time.time()
-        while self.running:
-            self.clock.tick(self.fps)
-            now = time.time()
-            self.dt = now - prev_time
-            prev_time = now
-            self.menu.show()
-            self.screen.fill((0, 0, 0))
-            self.input()
-            self.update_groups()
-            self.draw_groups()
-            self.game_time = pygame.time.get_ticks()
-            self.display.blit(self.screen, self.screen_position)
-            if self.running:
-                pygame.display.flip()
-        pygame.quit()
\ No newline at end of file
+        try:
+            while self.running:
+                self.clock.tick(self.fps)
+                now = time.time()
+                self.dt = now - prev_time
+                prev_time = now
+                if self.controls.holds_clock:  # recording: every read this frame gets the ticks the recorder saves
+                    utils.simulated_ticks = pygame.time.get_ticks()
+                if self.menu.running:
+                    self.menu.show()
+                    self.full_redraw = True
+                with self.profiler.scope('frame'):
+                    pygame.Surface.fill(self.screen, (0, 0, 0))  # layers drawn on top report their own dirty rects
+                    with self.profiler.scope('input'):
+                        self.input()
+                    self.update_groups()
+                    self.draw_groups()
+                    self.game_time = utils.get_ticks()
+                    if self.running:
+                        with self.profiler.scope('present'):
+                            self.present()
+        finally:  # closing the window mid frame raises, the clock must not stay held
+            utils.simulated_ticks = None
+            self.world_manager.cancel_next_level()
+        pygame.quit()
+
+    def run_headless(self, frames, dt=1 / 60, draw=False, present=False):
+        """Runs frames updates at a fixed dt as fast as possible, with time simulated instead of read from the clock.
+
+        Inputs come from self.controls (ScriptedInput, RandomInput or ReplayInput, which also supplies the recorded
+        ticks and dt). With draw the frame is also rendered off screen, with present it is shown in the window at
+        self.fps. Returns the number of frames simulated."""
+        hover_interval = 500  # ms, the ObjectManager hover timer
+        utils.simulated_ticks = 0
+        next_hover = hover_interval
+        self.enemy_manager.add_enemies()
+        profiler = self.profiler
+        try:
+            for frame in range(frames):
+                if not self.running:
+                    return frame
+                utils.simulated_ticks, self.dt = self.controls.frame_clock(frame, dt)
+                if utils.simulated_ticks >= next_hover:
+                    next_hover = utils.simulated_ticks + hover_interval
+                    pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+                with profiler.scope('frame'):
+                    with profiler.scope('input'):
+                        self.input()
+                    self.update_groups()
+                    if draw or present:
+                        pygame.Surface.fill(self.screen, (0, 0, 0))
+                        self.draw_groups()
+                    self.game_time = utils.simulated_ticks
+                if present:
+                    self.present()
+                    self.clock.tick(self.fps)
+            return frames
+        finally:  # the rest of the process reads the real clock again
+            utils.simulated_ticks = None
\ No newline at end of file
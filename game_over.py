@@ -41,10 +41,15 @@ class GameOver:
             self.game.screen.blit(self.image, self.position)
             # pygame.draw.rect(self.game.screen, (255, 255, 255), self.rect, 1)
 
+    def play_sound(self):
+        if not self.played:
+            self.game.sound_manager.play('game_over')
+            self.played = True
+
     def hover(self):
         if self.counter % 30 == 0:
             self.position[1] += self.hover_value
-        if pygame.time.get_ticks() % 1000 < 500:
+        if utils.get_ticks() % 1000 < 500:
             self.hover_value = -5
-        elif pygame.time.get_ticks() % 1000 > 500:
+        elif utils.get_ticks() % 1000 > 500:
             self.hover_value = 5
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""Headless simulation: no window, no sound and no menu, updates at a fixed timestep driven by scripted inputs.
+
+python headless.py --frames 10000 --seed 1
+"""
+import argparse
+import os
+import time
+
+os.environ['SDL_VIDEODRIVER'] = 'dummy'  # must be set before pygame is initialised by importing game
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+from controls import RandomInput
+from random_manager import rng
+from game import Game
+
+
+def run_headless(frames=3600, dt=1 / 60, controls=None, draw=False, seed=None):
+    game = Game(headless=True, controls=controls or RandomInput(seed), seed=seed)
+    start = time.perf_counter()
+    simulated = game.run_headless(frames, dt, draw)
+    elapsed = time.perf_counter() - start
+    return game, simulated, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--frames', type=int, default=3600)
+    parser.add_argument('--dt', type=float, default=1 / 60)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--draw', action='store_true', help='also render every frame off screen')
+    args = parser.parse_args()
+    game, simulated, elapsed = run_headless(args.frames, args.dt, draw=args.draw, seed=args.seed)
+    print(f'seed {rng.seed_value}: {simulated} frames ({game.game_time / 1000:.1f} s simulated) in {elapsed:.2f} s, '
+          f'{simulated / elapsed:.0f} frames/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,14 @@
 import pygame
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 import math
 import utils as utils
+from asset_manager import assets
+from flow_field import FlowField
 
 
 class Spritesheet(object):
     def __init__(self, filename):
-        self.sheet = pygame.image.load(filename).convert_alpha()
+        self.sheet = assets.image(filename)
 
     def image_at(self, rectangle, colorkey=None):
         rect = pygame.Rect(rectangle)
@@ -18,44 +20,171 @@ class Spritesheet(object):
         return image
 
 
-class Tile(pygame.sprite.Sprite):
-    def __init__(self, rectangle, x, y, spritesheet, size):
-        pygame.sprite.Sprite.__init__(self)
-        self.size = size
-        self.image = spritesheet.image_at(rectangle)
-        self.image = pygame.transform.scale(self.image, self.size)
-        self.rect = self.image.get_rect()
-        self.rect.x, self.rect.y = x, y
-        self.hitbox = utils.get_mask_rect(self.image, *self.rect.topleft)
+class DirtySurface(pygame.Surface):
+    """Map surface that remembers every region drawn on it since the last restore"""
 
-    def draw(self, surface):
-        surface.blit(self.image, (self.rect.x, self.rect.y))
+    def __init__(self, size, source):
+        pygame.Surface.__init__(self, size, 0, source)
+        self.dirty_rects = []
+        self.restored_rects = []  # regions cleared by the last restore, still visible on screen until redrawn
 
-    def change_image(self, rectangle, spritesheet):
-        self.image = spritesheet.image_at(rectangle)
-        self.image = pygame.transform.scale(self.image, self.size)
+    def blit(self, source, dest, area=None, special_flags=0):
+        rect = pygame.Surface.blit(self, source, dest, area, special_flags)
+        self.dirty_rects.append(rect)
+        return rect
+
+    def blits(self, blit_sequence, doreturn=1):
+        rects = pygame.Surface.blits(self, blit_sequence, True)
+        self.dirty_rects.extend(rects)
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        rect = pygame.Surface.fill(self, color, rect, special_flags)
+        self.dirty_rects.append(rect)
+        return rect
+
+    def mark_dirty(self, rect):
+        self.dirty_rects.append(pygame.Rect(rect))
+
+    def restore(self, original):
+        """Copies the baked tiles back only where something was drawn"""
+        colorkey = original.get_colorkey()
+        original.set_colorkey(None)  # with its black colorkey a blit would leave whatever was drawn over black
+        for rect in self.dirty_rects:
+            pygame.Surface.blit(self, original, rect, rect)
+        original.set_colorkey(colorkey)
+        self.restored_rects = self.dirty_rects
+        self.dirty_rects = []
+
+
+class TileAtlas:
+    """Tiles of a spritesheet cut, scaled and masked once per process and shared by every room"""
+
+    def __init__(self, filename='spritesheet.png', source_size=16):
+        self.filename = filename
+        self.source_size = source_size  # tile size in the sheet
+        self.spritesheet = None
+        self.tiles = {}  # (tile id, size) -> (image, bounding rect of its pixels relative to the tile, None if empty)
+
+    def tile(self, number, size):
+        key = (number, size)
+        if key not in self.tiles:
+            if self.spritesheet is None:
+                self.spritesheet = Spritesheet(self.filename)
+            x, y = TileMap.get_location(number)
+            image = self.spritesheet.image_at((x, y, self.source_size, self.source_size))
+            image = pygame.transform.scale(image, (size, size))
+            self.tiles[key] = image, utils.get_mask_rect(image)
+        return self.tiles[key]
+
+    def stats(self):
+        return {'tiles': len(self.tiles)}
+
+
+tile_atlas = TileAtlas()
+
+
+class RoomCache:
+    """Bounded LRU of the TileMaps with built surfaces, the least recently used one is released when it is full.
+
+    Released maps keep their tiles and walls and build the surfaces again on their next use."""
+
+    def __init__(self, capacity=6):
+        self.capacity = capacity  # current room, its door neighbours and one to spare, None never releases
+        self.maps = OrderedDict()  # TileMap -> None, most recently used last
+        self.builds = 0
+        self.evictions = 0
+
+    def touch(self, tile_map):
+        if tile_map in self.maps:
+            self.maps.move_to_end(tile_map)
+            return
+        self.maps[tile_map] = None
+        self.builds += 1
+        while self.capacity is not None and len(self.maps) > self.capacity:
+            evicted, _ = self.maps.popitem(last=False)
+            evicted.release()
+            self.evictions += 1
+
+    def clear(self):
+        maps = list(self.maps)
+        self.maps.clear()
+        for tile_map in maps:
+            tile_map.release()
+
+    def stats(self):
+        return {'built': len(self.maps), 'builds': self.builds, 'evictions': self.evictions}
+
+
+room_cache = RoomCache()
 
 
 class TileMap:
-    def __init__(self, room, filename, spritesheet, tile_size=64):
+    layered = True  # restore dirty regions from the baked layers instead of copying the whole surface every frame
+
+    def __init__(self, room, filename, atlas=tile_atlas, tile_size=64, layered=None):
         self.room = room
+        if layered is not None:
+            self.layered = layered
         # self.map_width = len(filename[0][0])
         # self.map_height = len(filename[0]) + 1
         # self.map_size = (len(filename[0][0]) * 64 + 128, (len(filename[0]) + 1) * 64)
         self.map_size = (utils.world_size[0], utils.world_size[1])
         self.tile_size = tile_size
-        self.spritesheet = spritesheet
-        self.wall_list = []
+        self.atlas = atlas
+        self.wall_grid = {}  # (column, row) -> hitboxes of the wall tiles in that cell, across all layers
+        self.grid_size = (0, 0)  # (columns, rows) of the largest layer
         self.door = namedtuple('Door', ['direction', 'value', 'tile'])
-        self.tiles = []
+        self.tiles = []  # per layer, (image, position) of every visible tile for Surface.blits
         self.filename = filename
         self.load_tiles(filename)
-        self.original_map_surface = pygame.Surface(self.map_size).convert()
-        self.original_map_surface.set_colorkey((0, 0, 0, 0))
-        self.map_surface = None
+        self.flow_field = FlowField(self)  # paths to the player around the walls, see EnemyManager.update_enemies
+        self.original_map_surface = None  # baked tile layers, built on first use, see materialize
+        self.surface = None
         self.x, self.y = 0, 0  # position of map surface on screen surface
         self.game = None
-        self.load_map()
+
+    @property
+    def map_surface(self):
+        if self.surface is None:
+            self.materialize()
+        return self.surface
+
+    def materialize(self):
+        """Builds the surfaces if room_cache released them or they were never built, and marks the map as used"""
+        if self.original_map_surface is None:
+            self.original_map_surface = pygame.Surface(self.map_size).convert()
+            self.original_map_surface.set_colorkey((0, 0, 0, 0))
+            self.load_map()
+        room_cache.touch(self)
+
+    def release(self):
+        self.original_map_surface = None
+        self.surface = None
+
+    def get_cell(self, x, y):
+        """Returns (column, row) of the tile cell containing the point, tiles start at (tile_size, tile_size / 2)"""
+        return int((x - self.tile_size) // self.tile_size), int((y - self.tile_size / 2) // self.tile_size)
+
+    def wall_at(self, point):
+        for hitbox in self.wall_grid.get(self.get_cell(*point), ()):
+            if hitbox.collidepoint(point):
+                return True
+        return False
+
+    def wall_collision(self, points):
+        """Checks if any of the points is inside a wall, looking only at the cells the points fall in"""
+        return any(self.wall_at(point) for point in points)
+
+    def wall_in_rect(self, rect):
+        left, top = self.get_cell(rect.left, rect.top)
+        right, bottom = self.get_cell(rect.right - 1, rect.bottom - 1)
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                for hitbox in self.wall_grid.get((column, row), ()):
+                    if hitbox.colliderect(rect):
+                        return True
+        return False
 
     def correct_map_position(self):
         if self.y != 0:
@@ -64,19 +193,33 @@ class TileMap:
             self.x = 0
 
     def draw_map(self, surface):
-        surface.blit(self.map_surface, (self.x, self.y))
+        self.materialize()
+        if self.layered and hasattr(surface, 'mark_dirty'):  # report only what changed since the last frame
+            pygame.Surface.blit(surface, self.map_surface, (self.x, self.y))
+            for rect in self.map_surface.dirty_rects + self.map_surface.restored_rects:
+                surface.mark_dirty(rect.move(self.x, self.y))
+        else:
+            surface.blit(self.map_surface, (self.x, self.y))
         self.clear_map()
-        # for wall in self.wall_list:
-        #     pygame.draw.rect(surface, (255, 255, 255), wall.rect, 2)
+        # for walls in self.wall_grid.values():
+        #     for wall in walls:
+        #         pygame.draw.rect(surface, (255, 255, 255), wall, 2)
 
     def clear_map(self):
-        self.map_surface = self.original_map_surface.copy()
+        if not self.layered:
+            self.surface = self.original_map_surface.copy()
+        elif self.surface is None:
+            self.surface = DirtySurface(self.map_size, self.original_map_surface)
+            self.surface.set_colorkey(self.original_map_surface.get_colorkey())
+            pygame.Surface.blit(self.surface, self.original_map_surface, (0, 0))
+        else:
+            self.surface.restore(self.original_map_surface)
 
     def load_map(self):
         self.original_map_surface.fill(utils.BLACK)
         for layer in self.tiles:
-            for tile in layer:
-                tile.draw(self.original_map_surface)
+            self.original_map_surface.blits(layer, False)
+        self.surface = None
         self.clear_map()
 
     @staticmethod
@@ -87,16 +230,20 @@ class TileMap:
 
 
     def load_tiles(self, filename):
+        size = self.tile_size
         for file in filename:
             tiles = []
-            x, y = 0, self.tile_size / 2
-            for row in file:
-                x = self.tile_size
-                for tile in row:
-                    tiles.append(Tile((*self.get_location(int(tile)), 16, 16), x, y, self.spritesheet,
-                                      (self.tile_size, self.tile_size)))
-                    if int(tile) in utils.wall_list:
-                        self.wall_list.append(tiles[-1])
-                    x += self.tile_size
-                y += self.tile_size
+            y = size // 2
+            for row_number, row in enumerate(file):
+                x = size
+                for column_number, tile in enumerate(row):
+                    image, hitbox = self.atlas.tile(int(tile), size)
+                    if hitbox:  # fully transparent tiles draw nothing and block nothing
+                        tiles.append((image, (x, y)))
+                        if int(tile) in utils.wall_list:
+                            self.wall_grid.setdefault((column_number, row_number), []).append(hitbox.move(x, y))
+                    x += size
+                y += size
+            self.grid_size = (max(self.grid_size[0], max(map(len, file), default=0)),
+                              max(self.grid_size[1], len(file)))
             self.tiles.append(tiles)
\ No newline at end of file
@@ -1,17 +1,50 @@
-import copy
 import csv
-import random
+import numpy
+from random_manager import rng
 from weapon import Shotgun, DestroyerCannon, Armyknife, Bow, Revolver, Katana
 
 
 
-from map import TileMap, Spritesheet
+from map import TileMap
 
 from particles import Fire
 import utils as utils
 
 
+class RoomTemplates:
+    """Room CSV layers parsed once per process into int16 arrays, door variants of a layer are shared by every room
+    with the same doors. Arrays handed out are read only, copy one before editing it."""
+
+    def __init__(self, path='maps'):
+        self.path = path
+        self.templates = {}  # file -> layer as in the csv
+        self.variants = {}  # (file, doors) -> layer with the missing doors shut
+
+    def template(self, file):
+        if file not in self.templates:
+            with open(f'{self.path}/{file}.csv', newline='') as f:
+                layer = numpy.array(list(csv.reader(f)), dtype=numpy.int16)
+            layer.flags.writeable = False
+            self.templates[file] = layer
+        return self.templates[file]
+
+    def shut(self, file, doors):
+        key = (file, frozenset(doors))
+        if key not in self.variants:
+            layer = self.template(file).copy()
+            World.shut_doors(doors, layer, file)
+            layer.flags.writeable = False
+            self.variants[key] = layer
+        return self.variants[key]
+
+
+room_templates = RoomTemplates()
+
+
 class Room:
+    __slots__ = ('x', 'y', 'position', 'neighbours', 'doors', 'type', 'room_map', 'tile_map', 'discovered',
+                 'enemy_list', 'objects')
+
     def __init__(self, x, y):
         self.x = x  # position in game world
         self.y = y
@@ -19,7 +52,7 @@ class Room:
         self.neighbours = []  # neighbouring rooms coordinates
         self.doors = []  # door locations
         self.type = None  # type of the room
-        self.room_map = []  # csv file of Tile identifiers
+        self.room_map = []  # layers of Tile identifiers, see RoomTemplates
         self.tile_map = None  # TileMap
         self.discovered = False  # player been in this room
         self.enemy_list = []  # list of enemies at that room
@@ -54,18 +87,22 @@ class Room:
 
 
 class World:
-    def __init__(self, wm, game, num_of_rooms, width, height):
-        self.level = wm.level
+    generator = 'walk'  # 'walk' restarts a random walk on dead ends, 'tree' grows a branching floor in linear time
+
+    def __init__(self, wm, game, num_of_rooms, width, height, random=None, level=None, build=True):
+        self.level = wm.level if level is None else level
         self.game = game
+        self.random = random or rng.worldgen  # a stream of its own when the world is planned in a worker thread
         self.num_of_rooms = num_of_rooms
         self.width = width
         self.height = height
         self.world = [[None for _ in range(width)] for _ in range(height)]  # populate world with
-        self.x, self.y = random.randint(0, height - 1), random.randint(0, width - 1)  # current world coordinates
+        self.x, self.y = self.random.randint(0, height - 1), self.random.randint(0, width - 1)  # current world coordinates
         self.starting_room = None
-        self.create_world()
+        self.create_world(build)
 
-    def create_world(self):
+    def create_world(self, build=True):
+        """Plans the rooms and their tile layers, without build only plain data is created, see build_steps"""
         self.generate_rooms()
         self.assign_type()
         # self.add_neighbors()
@@ -73,8 +110,18 @@ class World:
         self.add_room_map('mapa3')
         self.add_room_map('floor_layer')
         self.add_room_map('wall_layer')
-        self.add_graphics()
-        # self.print_world()
+        if build:
+            self.add_graphics()
+            # self.print_world()
+            self.assign_objects()
+
+    def build_steps(self):
+        """Builds the surfaces and objects of a world planned without build, one room per step"""
+        for row in self.world:
+            for room in row:
+                if isinstance(room, Room):
+                    room.tile_map = TileMap(room, room.room_map)
+                    yield room
         self.assign_objects()
 
     @staticmethod
@@ -97,6 +144,48 @@ class World:
         target_room.neighbours.append(room)
 
     def generate_rooms(self):
+        if self.generator == 'tree':
+            self.grow_rooms()
+        else:
+            self.walk_rooms()
+
+    def grow_rooms(self):
+        """Grows a tree of rooms from the starting room, every new room hangs off a random room with a free side.
+
+        Each step either adds a room or retires a room without free sides, so it never restarts and runs in time
+        linear in num_of_rooms on grids of any size. The boss gets the room farthest from the start."""
+        num_of_rooms = min(self.num_of_rooms, self.width * self.height)
+        self.starting_room = self.world[self.x][self.y] = Room(self.x, self.y)
+        self.starting_room.type = 'starting_room'
+        rooms = [self.starting_room]
+        depth = {self.starting_room: 0}  # doors from the start
+        open_rooms = [self.starting_room]  # rooms that may still have a free side
+        num_monster_rooms = 2
+        while len(rooms) < num_of_rooms:
+            index = self.random.randrange(len(open_rooms))
+            room = open_rooms[index]
+            self.x, self.y = room.x, room.y
+            empty_spaces = self.check_free_space()
+            if not empty_spaces:
+                open_rooms[index] = open_rooms[-1]
+                open_rooms.pop()
+                continue
+            x, y = self.random.choice(empty_spaces)
+            self.world[x][y] = new_room = Room(x, y)
+            if num_monster_rooms:  # the rooms next to the start are guarded, as on walked floors
+                new_room.type = 'normal'
+                num_monster_rooms -= 1
+            self.add_neighbour(room, [x, y])
+            self.add_neighbour(new_room, [room.x, room.y])
+            depth[new_room] = depth[room] + 1
+            rooms.append(new_room)
+            open_rooms.append(new_room)
+        for room in rooms:
+            room.add_doors()
+        if len(rooms) > 1:
+            max(reversed(rooms), key=depth.get).type = 'boss'
+
+    def walk_rooms(self):
         room_counter = 0  # counts current number of rooms - 1
         prev_room = [self.x, self.y]  # added
         current_room = None
@@ -116,7 +205,7 @@ class World:
                 prev_room = [self.x, self.y]
             empty_spaces = self.check_free_space()
             if empty_spaces:
-                new_room = random.choice(empty_spaces)
+                new_room = self.random.choice(empty_spaces)
                 self.x, self.y = new_room[0], new_room[1]
                 if room_counter != self.num_of_rooms - 1:
                     self.world[prev_room[0]][prev_room[1]].neighbours.append([self.x, self.y])
@@ -183,31 +272,26 @@ class World:
 
     def random_floor_layout(self, room_map):
         w = [10, 1, 1, 1, 1, 0.2, 0.2, 0.2]
-        floor_tiles = [129, 130, 131, 161, 162, 163, 193, 194]
-        for x in range(len(room_map)):
-            for y in range(len(room_map[0])):
-                if int(room_map[x][y]) in utils.floor_tiles:
-                    room_map[x][y] = random.choices(utils.floor_tiles, w, k=1)[0]
+        floor = numpy.isin(room_map, utils.floor_tiles)
+        room_map[floor] = self.random.choices(utils.floor_tiles, w, k=int(floor.sum()))
 
     def add_room_map(self, file):
-        with open(f'maps/{file}.csv', newline='') as f:  # load room template
-            reader = csv.reader(f)
-            basic_map = list(reader)
-
         for row in self.world:  # make passage through rooms
             for room in row:
                 if isinstance(room, Room):
-                    room_map = copy.deepcopy(basic_map)  # csv file
-                    if file == 'floor_layer':
+                    if file == 'floor_layer':  # floors are randomised, the only layer a room gets a copy of
+                        room_map = room_templates.template(file).copy()
                         self.random_floor_layout(room_map)
-                    self.shut_doors(room.doors, room_map, file)
+                        self.shut_doors(room.doors, room_map, file)
+                    else:
+                        room_map = room_templates.shut(file, room.doors)
                     room.room_map.append(room_map)
 
     def add_graphics(self):
         for row in self.world:
             for room in row:
                 if isinstance(room, Room):
-                    room.tile_map = TileMap(room, room.room_map, Spritesheet("spritesheet.png"))
+                    room.tile_map = TileMap(room, room.room_map)
 
     def assign_objects(self):
         for row in self.world:
@@ -239,5 +323,5 @@ class World:
         for row in self.world:
             for room in row:
                 if isinstance(room, Room) and room.type is None:
-                    room.type = random.choices(types, weights=[2, 4, 1, 1], k=1)[0]
+                    room.type = self.random.choices(types, weights=[2, 4, 1, 1], k=1)[0]
                     ok_rooms.append(room)
\ No newline at end of file
@@ -1,14 +1,22 @@
 import pygame
 from utils import get_mask_rect
 import utils as utils
-import random
+from random_manager import rng
 import math
+from asset_manager import assets
+from text_renderer import text_renderer
 
 
 class ShowName:
+    __slots__ = ('object', 'line_length', 'time', 'text', 'text_length', 'text_position', 'counter')
+
     # TODO drawing animation dependent on player position
     def __init__(self, object):
         self.object = object
+        self.reset()
+
+    def reset(self):
+        """Back to the state of a new helper, for pooled objects"""
         self.line_length = 0
         self.time = 0
         # Format weapon display name
@@ -20,7 +28,7 @@ class ShowName:
     @staticmethod
     def time_passed(time, amount):
         """Wait 'amount' amount of time"""
-        if pygame.time.get_ticks() - time > amount:
+        if utils.get_ticks() - time > amount:
             return True
 
     def draw(self, surface, rect):
@@ -28,7 +36,7 @@ class ShowName:
         self.draw_text(surface)
 
     def draw_text(self, surface):
-        text_surface = pygame.font.Font(utils.font, 15).render(self.text[:self.counter], True, (255, 255, 255))
+        text_surface = text_renderer.render(self.text[:self.counter], 15, (255, 255, 255))
         surface.blit(text_surface, self.text_position)
 
     def draw_text_line(self, surface, rect):
@@ -36,13 +44,14 @@ class ShowName:
         for _ in range(5):  # we draw rectangles in diagonal line, so the line looks pixelated
             starting_position[0] -= 5
             starting_position[1] -= 5
-            pygame.draw.rect(surface, (255, 255, 255), (starting_position[0], starting_position[1], 5, 5))
+            utils.mark_dirty(surface, pygame.draw.rect(surface, (255, 255, 255),
+                                                       (starting_position[0], starting_position[1], 5, 5)))
 
         starting_position[1] += 2  # adjustment of vertical position
         end_position = [starting_position[0] - self.line_length, starting_position[1]]
-        pygame.draw.line(surface, (255, 255, 255), starting_position, end_position, 5)
+        utils.mark_dirty(surface, pygame.draw.line(surface, (255, 255, 255), starting_position, end_position, 5))
         if self.line_length <= self.text_length * 8 and self.time_passed(self.time, 15):
-            self.time = pygame.time.get_ticks()
+            self.time = utils.get_ticks()
             self.line_length += 8
             self.counter += 1
         self.text_position = (end_position[0], end_position[1] - 20)
@@ -53,17 +62,21 @@ class ShowName:
 
 
 class ShowPrice(ShowName):
+    __slots__ = ('image', 'images', 'image_size', 'image_rect', 'animation_frame')
+
     def __init__(self, object):
-        super().__init__(object)
-        # Format weapon display name
-        self.text = str(self.object.value)
-        self.text_length = len(self.text)
-        self.text_position = None
-        self.counter = 0
         self.image = None
         self.images = []
         self.image_size = (24, 24)
         self.load_image()
+        super().__init__(object)
+
+    def reset(self):
+        super().reset()
+        # Format weapon display name
+        self.text = str(self.object.value)
+        self.text_length = len(self.text)
+        self.image = self.images[0]
         self.image_rect = self.image.get_rect()
         self.text_position = (0, 0)
         self.animation_frame = 0
@@ -73,9 +86,8 @@ class ShowPrice(ShowName):
         self.image_rect = (position[0] - 25, position[1] - 8)
 
     def load_image(self):
+        image = assets.image('src/assets/objects/coin/coin.png', self.image_size)
         for i in range(4):
-            image = pygame.image.load(f'src/assets/objects/coin/coin.png').convert_alpha()
-            image = pygame.transform.scale(image, self.image_size)
             self.images.append(image)
         self.image = self.images[0]
 
@@ -91,7 +103,7 @@ class ShowPrice(ShowName):
         self.update_animation_frame()
 
     def draw_text(self, surface):
-        text_surface = pygame.font.Font(utils.font, 18).render(self.text, True, (255, 255, 255))
+        text_surface = text_renderer.render(self.text, 18, (255, 255, 255))
         surface.blit(text_surface, self.text_position)
 
     def draw(self, surface):
@@ -101,9 +113,14 @@ class ShowPrice(ShowName):
 
 
 class Hovering:
+    __slots__ = ('game', 'object', 'hover_value', 'position')
+
     def __init__(self, game, obj):
-        self.game = game
         self.object = obj
+        self.reset(game)
+
+    def reset(self, game):
+        self.game = game
         self.hover_value = 0
         self.position = 1
 
@@ -127,10 +144,15 @@ class Hovering:
 
 
 class Shadow:
+    __slots__ = ('game', 'object', 'shadow_position', 'shadow_set', 'hover_value', 'position', 'correct',
+                 'shadow_width')
 
     def __init__(self, game, object, correct=0):
-        self.game = game
         self.object = object
+        self.reset(game, correct)
+
+    def reset(self, game, correct=0):
+        self.game = game
         self.shadow_position = None
         self.shadow_set = False
         self.hover_value = 0
@@ -142,11 +164,8 @@ class Shadow:
         self.correct = correct
 
     def draw_shadow(self, surface):
-        color = (0, 0, 0, 120)
-        shape_surf = pygame.Surface((50, 50), pygame.SRCALPHA).convert_alpha()
-        pygame.draw.ellipse(shape_surf, color, (
+        shape_surf = utils.shadow_sprite(50, (
             self.position / 3, 0, self.shadow_width / 2 + 4 + self.correct + self.position, 10 + self.position))
-        shape_surf = pygame.transform.scale(shape_surf, (100, 100))
         surface.blit(shape_surf, self.shadow_position)
 
     def set_shadow_position(self, value=0):
@@ -155,6 +174,11 @@ class Shadow:
 
 
 class Object:
+    # every coin is an Object, subclasses without __slots__ of their own still get a __dict__
+    __slots__ = ('game', 'room', 'name', 'object_type', 'size', 'player', 'original_image', 'image_picked',
+                 'hud_image', 'image', 'path', 'rect', 'hitbox', 'show_name', 'value', 'show_price', 'hovering',
+                 'shadow', 'interaction', 'dropped', 'for_sale', 'bounce')
+
     def __init__(self, game, name, object_type, size=None, room=None, position=None, player=None):
         self.game = game
         self.room = room
@@ -186,7 +210,7 @@ class Object:
         return self.name
 
     def activate_bounce(self):
-        self.bounce = Bounce(self.rect.x, self.rect.y, self.rect.y + random.randint(0, 123), self.size)
+        self.bounce = Bounce(self.rect.x, self.rect.y, self.rect.y + rng.loot.randint(0, 123), self.size)
 
     def draw_shadow(self, surface, value=0):
         if self.dropped:
@@ -214,9 +238,7 @@ class Object:
             self.rect.y = self.bounce.y
 
     def load_image(self):
-        self.original_image = pygame.image.load(
-            f'{self.path}/{self.name}.png').convert_alpha()
-        self.original_image = pygame.transform.scale(self.original_image, self.size)
+        self.original_image = assets.image(f'{self.path}/{self.name}.png', self.size)
         self.image = self.original_image
 
     def detect_collision(self):
@@ -268,11 +290,13 @@ class Object:
 
 
 class Bounce:
+    __slots__ = ('speed', 'angle', 'drag', 'elasticity', 'gravity', 'limit', 'limits', 'x', 'y', 'size')
+
     def __init__(self, x, y, limit, size):
-        self.speed = random.uniform(0.5, 0.6)  # 0.5
-        self.angle = random.randint(-10, 10) / 10  # random.choice([10, -10])
+        self.speed = rng.loot.uniform(0.5, 0.6)  # 0.5
+        self.angle = rng.loot.randint(-10, 10) / 10  # random.choice([10, -10])
         self.drag = 0.999
-        self.elasticity = random.uniform(0.75, 0.9)  # 0.75
+        self.elasticity = rng.loot.uniform(0.75, 0.9)  # 0.75
         self.gravity = (math.pi, 0.002)
         self.limit = limit
         self.limits = [limit, 654]
@@ -317,6 +341,6 @@ class Bounce:
 
     def reset(self):
         self.speed = 0.5
-        self.angle = random.choice([10, -10])
+        self.angle = rng.loot.choice([10, -10])
         self.drag = 0.999
         self.elasticity = 0.75
@@ -0,0 +1,137 @@
+import numpy
+import pygame
+from collections import namedtuple
+
+# One emitter preset per simple particle type in particles.py. Per tick a particle moves by its velocity plus a
+# jitter, a whole number from the jitter range times jitter_step as the randint calls of the particle classes, but
+# only with probability move_chance; radius and life decay by shrink and decay, and it dies when either reaches
+# zero. shape 'rect' draws a size x size square instead of a circle.
+EmitterPreset = namedtuple('EmitterPreset', ['palette', 'shape', 'radius', 'shrink', 'life', 'decay', 'jitter_x',
+                                             'jitter_y', 'move_chance', 'size', 'flicker', 'jitter_step'],
+                           defaults=(1,))
+
+PRESETS = {
+    'enemy_hit': EmitterPreset(palette=[(255, 0, 0)], shape='circle', radius=(3, 8), shrink=0.2, life=(1, 1),
+                               decay=0, jitter_x=(-1, 1), jitter_y=(-1, 1), move_chance=1, size=0, flicker=False),
+    'wall_hit': EmitterPreset(palette=[(128, 148, 171)], shape='circle', radius=(10, 10), shrink=0.7, life=(1, 1),
+                              decay=0, jitter_x=(-1, 1), jitter_y=(-1, 1), move_chance=1, size=0, flicker=False),
+    'staff': EmitterPreset(palette=[(151, 218, 63), (140, 218, 63), (160, 218, 63)], shape='circle', radius=(7, 8),
+                           shrink=0.2, life=(1, 1), decay=0, jitter_x=(-1, 1), jitter_y=(-1, 1), move_chance=1,
+                           size=0, flicker=True),
+    'dust': EmitterPreset(palette=[(173, 173, 172)], shape='rect', radius=(1, 1), shrink=0, life=(4, 5), decay=0.5,
+                          jitter_x=(0, 0), jitter_y=(-3, 2), move_chance=1, size=5, flicker=False, jitter_step=0.25),
+    'chest': EmitterPreset(palette=[(232, 209, 58), (255, 255, 255), (232, 67, 58)], shape='rect', radius=(1, 1),
+                           shrink=0, life=(1, 1), decay=0.15, jitter_x=(-8, 8), jitter_y=(-8, -2), move_chance=1 / 7,
+                           size=8, flicker=True),
+}
+
+
+class ParticleBuffer:
+    """Structure of arrays particle store: position, velocity, radius, life and colour index live in NumPy arrays,
+    are updated in one vectorized pass per tick and dead particles are compacted in bulk. The arrays are float64 like
+    the Python floats of the particle classes, so a particle dies on the same tick in both."""
+    fields = ('x', 'y', 'vx', 'vy', 'radius', 'life')
+
+    def __init__(self, capacity=256, presets=PRESETS, rng=None):
+        self.presets = presets
+        self.preset_names = list(presets)
+        self.rng = rng if rng is not None else numpy.random.default_rng()
+        self.count = 0
+        self.capacity = capacity
+        for field in self.fields:
+            setattr(self, field, numpy.zeros(capacity))
+        self.color = numpy.zeros(capacity, dtype=numpy.int16)  # index into the preset palette
+        self.preset = numpy.zeros(capacity, dtype=numpy.int16)  # index into preset_names
+        self.sprites = {}  # (preset index, colour index, radius) -> surface
+
+    def __len__(self):
+        return self.count
+
+    def grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for field in self.fields + ('color', 'preset'):
+            array = getattr(self, field)
+            grown = numpy.zeros(capacity, dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            setattr(self, field, grown)
+        self.capacity = capacity
+
+    def emit(self, name, x, y, count=1, vx=0.0, vy=0.0):
+        preset = self.presets[name]
+        if self.count + count > self.capacity:
+            self.grow(self.count + count)
+        start, end = self.count, self.count + count
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = vx
+        self.vy[start:end] = vy
+        self.radius[start:end] = self.rng.integers(preset.radius[0], preset.radius[1] + 1, count)
+        self.life[start:end] = self.rng.integers(preset.life[0], preset.life[1] + 1, count)
+        self.color[start:end] = self.rng.integers(0, len(preset.palette), count)
+        self.preset[start:end] = self.preset_names.index(name)
+        self.count = end
+
+    def update(self):
+        n = self.count
+        if not n:
+            return
+        rng = self.rng
+        x, y, radius, life = self.x[:n], self.y[:n], self.radius[:n], self.life[:n]
+        preset = self.preset[:n]
+        for index, name in enumerate(self.preset_names):
+            selected = preset == index
+            if not selected.any():
+                continue
+            p = self.presets[name]
+            k = int(selected.sum())
+            moving = rng.random(k) < p.move_chance
+            jitter_x = rng.integers(p.jitter_x[0], p.jitter_x[1] + 1, k) * p.jitter_step
+            jitter_y = rng.integers(p.jitter_y[0], p.jitter_y[1] + 1, k) * p.jitter_step
+            x[selected] += (self.vx[:n][selected] + jitter_x) * moving
+            y[selected] += (self.vy[:n][selected] + jitter_y) * moving
+            radius[selected] -= p.shrink
+            life[selected] -= p.decay * moving
+            if p.flicker:
+                self.color[:n][selected] = rng.integers(0, len(p.palette), k)
+        alive = (radius > 0) & (life > 0)
+        if not alive.all():
+            self.compact(alive)
+
+    def compact(self, alive):
+        n = self.count
+        kept = int(alive.sum())
+        for field in self.fields + ('color', 'preset'):
+            array = getattr(self, field)
+            array[:kept] = array[:n][alive]
+        self.count = kept
+
+    def sprite(self, preset_index, color_index, radius):
+        key = (preset_index, color_index, radius)
+        if key not in self.sprites:
+            preset = self.presets[self.preset_names[preset_index]]
+            color = preset.palette[color_index][:3]
+            if preset.shape == 'rect':
+                image = pygame.Surface((preset.size, preset.size)).convert()
+                image.fill(color)
+            else:
+                image = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA).convert_alpha()
+                pygame.draw.circle(image, color, (radius, radius), radius)
+            self.sprites[key] = image
+        return self.sprites[key]
+
+    def draw(self, surface):
+        n = self.count
+        if not n:
+            return
+        radius = self.radius[:n].astype(numpy.int32)
+        is_rect = numpy.array([self.presets[name].shape == 'rect' for name in self.preset_names])[self.preset[:n]]
+        offset = numpy.where(is_rect, 0, radius)
+        visible = is_rect | (radius > 0)
+        left = (self.x[:n] - offset).astype(numpy.int32)[visible].tolist()
+        top = (self.y[:n] - offset).astype(numpy.int32)[visible].tolist()
+        keys = (self.preset[:n].astype(numpy.int32) * 256 + self.color[:n]) * 256 + numpy.minimum(radius, 255)
+        unique, inverse = numpy.unique(keys[visible], return_inverse=True)
+        images = [self.sprite(key // 65536, key // 256 % 256, key % 256) for key in unique.tolist()]
+        surface.blits(zip(map(images.__getitem__, inverse.tolist()), zip(left, top)), False)
@@ -1,60 +1,83 @@
 import pygame
-import random
+from random_manager import rng
 from math import sin
 import math
 import utils as utils
 import time
+from asset_manager import assets
+from particle_buffer import ParticleBuffer
+from pool import pool
 
 
 
 class Particle:
-    def __init__(self, game, x, y):
+    __slots__ = ('game', 'x', 'y', 'life', 'radius', 'color')  # created by the hundred, no per instance dict
+    preset = None  # ParticleBuffer preset used instead of this object when the manager is vectorized
+
+    def __init__(self, *args, **kwargs):
+        self.reset(*args, **kwargs)
+
+    def reset(self, game, x, y):
+        """Sets up a new or pooled particle, subclasses extend it instead of __init__"""
         self.game = game
         self.x = x
         self.y = y
         self.life = None  # how long should particle live(frames)
 
+    def preset_velocity(self):
+        return 0, 0
+
 
 class EnemyHitParticle(Particle):
+    __slots__ = ()
+    preset = 'enemy_hit'
     color = (255, 0, 0)
-    radius = random.randint(3, 8)
+    radius_range = (3, 8)  # drawn for every particle, as the enemy_hit preset does
+
+    def reset(self, game, x, y):
+        super().reset(game, x, y)
+        self.radius = rng.cosmetic.randint(*self.radius_range)
 
     def update(self):
-        self.x += random.randint(-1, 1)
-        self.y += random.randint(-1, 1)
+        self.x += rng.cosmetic.randint(-1, 1)
+        self.y += rng.cosmetic.randint(-1, 1)
         self.radius -= 0.20
         if self.radius <= 0:
-            self.game.particle_manager.particle_list.remove(self)
+            self.game.particle_manager.remove_particle(self)
 
     def draw(self, surface):
-        pygame.draw.circle(surface, self.color, (self.x, self.y), self.radius)
+        utils.mark_dirty(surface, pygame.draw.circle(surface, self.color, (self.x, self.y), self.radius))
 
 
 class WallHitParticle(Particle):
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
+    __slots__ = ()
+    preset = 'wall_hit'
+
+    def reset(self, game, x, y):
+        super().reset(game, x, y)
         self.color = (128, 148, 171)
         self.radius = 10
 
     def update(self):
-        self.x += random.randint(-1, 1)
-        self.y += random.randint(-1, 1)
+        self.x += rng.cosmetic.randint(-1, 1)
+        self.y += rng.cosmetic.randint(-1, 1)
         self.radius -= 0.7
 
         if self.radius <= 0:
-            self.game.particle_manager.particle_list.remove(self)
+            self.game.particle_manager.remove_particle(self)
 
     def draw(self, surface):
-        pygame.draw.circle(surface, self.color, (self.x, self.y), self.radius)
+        utils.mark_dirty(surface, pygame.draw.circle(surface, self.color, (self.x, self.y), self.radius))
 
 
 class Fire(Particle):
     """Besides some calculations and magic variables, there is a bsurf Surface in game class, which serves as screen
     to display fire plarticles, it is 4x times smaller than default window, but during blitting, it is resized to
     window size, as to achieve pixelated fire)"""
+    __slots__ = ('max_life', 'sin', 'sin_r', 'ox', 'oy', 'j', 'i', 'alpha', 'draw_x', 'draw_y')
 
-    def __init__(self, game, x, y, option='normal'):
-        super().__init__(game, x, y)
+    def reset(self, game, x, y, option='normal'):
+        super().reset(game, x, y)
         self.color = ((255, 255, 0),
                       (255, 173, 51),
                       (247, 117, 33),
@@ -62,41 +85,41 @@ class Fire(Particle):
                       (115, 61, 56),
                       (61, 38, 48))
         if option == 'normal':
-            self.max_life = random.randint(6, 13)
+            self.max_life = rng.cosmetic.randint(6, 13)
             self.life = self.max_life
-            self.sin = random.randint(-10, 10) / 7
-            self.sin_r = random.randint(5, 10)
-            self.radius = random.randint(0, 4)
-            self.ox = random.randint(-1, 1)
-            self.oy = random.randint(-1, 1)
-            self.j = random.randint(0, 360)
+            self.sin = rng.cosmetic.randint(-10, 10) / 7
+            self.sin_r = rng.cosmetic.randint(5, 10)
+            self.radius = rng.cosmetic.randint(0, 4)
+            self.ox = rng.cosmetic.randint(-1, 1)
+            self.oy = rng.cosmetic.randint(-1, 1)
+            self.j = rng.cosmetic.randint(0, 360)
             self.i = int(((self.life - 1) / self.max_life) * 6)
             self.alpha = None
         elif option == 'enemy':
-            self.max_life = random.randint(6, 9)
+            self.max_life = rng.cosmetic.randint(6, 9)
             self.life = self.max_life
-            self.sin = random.randint(-10, 10) / 7
-            self.sin_r = random.randint(5, 10)
-            self.radius = random.randint(0, 2)
-            self.ox = random.randint(-1, 1)
-            self.oy = random.randint(-1, 1)
-            self.j = random.randint(0, 360)
+            self.sin = rng.cosmetic.randint(-10, 10) / 7
+            self.sin_r = rng.cosmetic.randint(5, 10)
+            self.radius = rng.cosmetic.randint(0, 2)
+            self.ox = rng.cosmetic.randint(-1, 1)
+            self.oy = rng.cosmetic.randint(-1, 1)
+            self.j = rng.cosmetic.randint(0, 360)
             self.i = int(((self.life - 1) / self.max_life) * 6)
             self.alpha = None
         self.draw_x = x
         self.draw_y = y
 
     def update(self):
-        if random.randint(1, 4) == 2:
+        if rng.cosmetic.randint(1, 4) == 2:
             if self.j > 360:  # Angle
                 self.j = 0
             self.life -= 1
             if self.life == 0:
-                self.game.particle_manager.fire_particles.remove(self)
+                self.game.particle_manager.remove_fire_particle(self)
             self.i = int((self.life / self.max_life) * 6)
             self.y -= 0.7  # rise
             self.x += 0  # ((self.sin * sin(self.j / self.sin_r)) / 20)  # spread
-            if not random.randint(0, 5):
+            if not rng.cosmetic.randint(0, 5):
                 self.radius += 0.2  # circle radius, set to 10 for big bang
             self.draw_x, self.draw_y = self.x, self.y
             self.draw_x += self.ox * (5 - self.i)
@@ -114,19 +137,22 @@ class Fire(Particle):
         if self.i == 0:
             pygame.draw.circle(surface,
                                (0, 0, 0, 0),
-                               (self.draw_x + random.randint(-1, 1),
+                               (self.draw_x + rng.cosmetic.randint(-1, 1),
                                 self.draw_y - 4),
                                self.radius * (((self.max_life - self.life) / self.max_life) / 0.88), 0)
         else:
             pygame.draw.circle(surface,
                                self.color[self.i - 1] + (alpha,),
-                               (self.draw_x + random.randint(-1, 1), self.draw_y - 3),
+                               (self.draw_x + rng.cosmetic.randint(-1, 1), self.draw_y - 3),
                                self.radius / 1.5, 0)
 
 
 class ChestParticle(Particle):
-    def __init__(self, game, x, y, chest):
-        super().__init__(game, x, y)
+    __slots__ = ('counter', 'chest')
+    preset = 'chest'
+
+    def reset(self, game, x, y, chest):
+        super().reset(game, x, y)
         self.color = [(232, 209, 58, 125), (255, 255, 255, 124), (232, 67, 58, 125)]
         self.radius = 4
         self.life = 1
@@ -135,25 +161,27 @@ class ChestParticle(Particle):
         # self.surface = pygame.Surface((64, 128)).convert_alpha()
 
     def update(self):
-        if random.randint(0, 6) == 5:
-            self.x += random.randint(-8, 8)
-            self.y += random.randint(-8, -2)
+        if rng.cosmetic.randint(0, 6) == 5:
+            self.x += rng.cosmetic.randint(-8, 8)
+            self.y += rng.cosmetic.randint(-8, -2)
             self.life -= 0.15
         if self.life <= 0:
-            self.game.particle_manager.particle_list.remove(self)
+            self.game.particle_manager.remove_particle(self)
 
     def draw(self, surface=None):
-        color = random.choice(self.color)
+        color = rng.cosmetic.choice(self.color)
         base_surface = self.chest.room.tile_map.map_surface
-        pygame.draw.rect(base_surface, color, (self.x, self.y, 8, 8))
+        utils.mark_dirty(base_surface, pygame.draw.rect(base_surface, color, (self.x, self.y, 8, 8)))
 
 
 class Bounce:
+    __slots__ = ('speed', 'angle', 'drag', 'elasticity', 'gravity', 'x', 'y')
+
     def __init__(self, x, y):
-        self.speed = random.uniform(0.5, 0.6)  # 0.5
-        self.angle = random.randint(-10, 10) / 10  # random.choice([10, -10])
+        self.speed = rng.cosmetic.uniform(0.5, 0.6)  # 0.5
+        self.angle = rng.cosmetic.randint(-10, 10) / 10  # random.choice([10, -10])
         self.drag = 0.999
-        self.elasticity = random.uniform(0.75, 0.9)  # 0.75
+        self.elasticity = rng.cosmetic.uniform(0.75, 0.9)  # 0.75
         self.gravity = (math.pi, 0.002)
         self.x, self.y = x, y
 
@@ -173,8 +201,10 @@ class Bounce:
 
 
 class PowerUpParticle(Particle):
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
+    __slots__ = ('counter', 'bounce')
+
+    def reset(self, game, x, y):
+        super().reset(game, x, y)
         self.color = [(255, 21, 121)]
         self.radius = 4
         self.life = 20
@@ -188,26 +218,32 @@ class PowerUpParticle(Particle):
         self.x = self.bounce.x
         self.y = self.bounce.y
         if self.life <= 0:
-            self.game.particle_manager.particle_list.remove(self)
+            self.game.particle_manager.remove_particle(self)
 
     def draw(self, surface):
-        color = random.choice(self.color)
-        pygame.draw.rect(surface, color, (self.x, self.y, 8, 8))
+        color = rng.cosmetic.choice(self.color)
+        utils.mark_dirty(surface, pygame.draw.rect(surface, color, (self.x, self.y, 8, 8)))
 
 
 class PowerUpAttackParticle(PowerUpParticle):
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
+    __slots__ = ()
+
+    def reset(self, game, x, y):
+        super().reset(game, x, y)
         self.color = [(255, 21, 121), (255, 111, 204)]
 
 
 class ShieldParticle(PowerUpParticle):
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
+    __slots__ = ()
+
+    def reset(self, game, x, y):
+        super().reset(game, x, y)
         self.color = [(3, 188, 139), (11, 144, 141)]
 
 
 class DeathAnimation:
+    __slots__ = ('game', 'x', 'y', 'images', 'entity', 'counter')
+
     def __init__(self, game, x, y, entity):
         self.game = game
         self.x = x
@@ -218,15 +254,14 @@ class DeathAnimation:
         self.counter = -0.5
 
     def load_images(self):
+        size = (192, 192) if self.entity.name == 'boss' else None
         for i in range(12):
-            self.images.append(pygame.image.load(f'src/assets/misc/death/death{i + 1}.png').convert_alpha())
-            if self.entity.name == 'boss':
-                self.images[-1] = pygame.transform.scale(self.images[-1], (192, 192))
+            self.images.append(assets.image(f'src/assets/misc/death/death{i + 1}.png', size))
 
     def update(self):
         self.counter += 0.3
         if self.counter >= 12:
-            self.game.particle_manager.particle_list.remove(self)
+            self.game.particle_manager.remove_particle(self)
             if self.entity.name == 'boss':
                 position = self.entity.rect.center
                 self.entity.room.objects.append(Hole(self.game, position, self.entity.room))
@@ -236,58 +271,74 @@ class DeathAnimation:
 
 
 class StaffParticle(Particle):
+    __slots__ = ('room',)
+    preset = 'staff'
     colors = ((151, 218, 63), (140, 218, 63), (160, 218, 63))
-    radius = random.randint(7, 8)
+    radius_range = (7, 8)
 
-    def __init__(self, game, x, y, room):
-        super().__init__(game, x, y)
+    def reset(self, game, x, y, room):
+        super().reset(game, x, y)
+        self.radius = rng.cosmetic.randint(*self.radius_range)
         self.room = room
 
     def update(self):
-        self.x += random.randint(-1, 1)
-        self.y += random.randint(-1, 1)
+        self.x += rng.cosmetic.randint(-1, 1)
+        self.y += rng.cosmetic.randint(-1, 1)
         self.radius -= 0.20
         if self.radius <= 0:
-            self.game.particle_manager.particle_list.remove(self)
+            self.game.particle_manager.remove_particle(self)
 
     def draw(self, surface):
-        color = random.choice(self.colors)
+        color = rng.cosmetic.choice(self.colors)
         surface = self.room.tile_map.map_surface
-        pygame.draw.circle(surface, color, (self.x, self.y), self.radius)
+        utils.mark_dirty(surface, pygame.draw.circle(surface, color, (self.x, self.y), self.radius))
 
 
 class Dust(Particle):
-    def __init__(self, game, player, x, y):
-        super().__init__(game, x, y)
+    __slots__ = ('player',)
+    preset = 'dust'
+
+    def reset(self, game, player, x, y):
+        super().reset(game, x, y)
         self.player = player
         self.x = x
         self.y = y
         self.color = pygame.Color(173, 173, 172, 0)
-        self.life = random.randint(4, 5)
-        if random.randint(1, 8) % 4 != 0:
+        self.life = rng.cosmetic.randint(4, 5)
+        if rng.cosmetic.randint(1, 8) % 4 != 0:
             self.life = 0
 
+    def preset_velocity(self):
+        if self.player.velocity[0] > 0:
+            return -0.375, 0
+        elif self.player.velocity[0] < 0:
+            return 0.375, 0
+        return 0, 0
+
     def update(self):
         # if self.player.velocity:
         if self.player.velocity[0] > 0:
-            self.x -= random.randint(1, 2) / 4
+            self.x -= rng.cosmetic.randint(1, 2) / 4
         elif self.player.velocity[0] < 0:
-            self.x += random.randint(1, 2) / 4
-        self.y -= random.randint(-2, 3) / 4
+            self.x += rng.cosmetic.randint(1, 2) / 4
+        self.y -= rng.cosmetic.randint(-2, 3) / 4
         self.life -= 0.5
         if self.life <= 0:
-            self.game.particle_manager.particle_list.remove(self)
+            self.game.particle_manager.remove_particle(self)
 
     def draw(self, surface):
         if self.player.velocity:
             rect = (self.x, self.y, 5, 5)
-            pygame.draw.rect(surface, self.color, rect)
+            utils.mark_dirty(surface, pygame.draw.rect(surface, self.color, rect))
 
 
 class ParticleManager:
+    vectorized = False  # simulate particle types with a preset in a NumPy ParticleBuffer instead of as objects
+
     def __init__(self, game):
         self.game = game
         self.particle_list = []
+        self.particle_buffer = ParticleBuffer(rng=rng.numpy_stream('cosmetic'))
         self.fire_particles = []
         # self.surface = self.game.screen
         self.surface = pygame.Surface((utils.world_size[0] // 4, utils.world_size[1] // 4),
@@ -296,14 +347,17 @@ class ParticleManager:
 
     def update_particles(self):
         if self.particle_list:
-            for particle in self.particle_list:
+            for particle in self.particle_list[:]:  # particles remove themselves while updating
                 particle.update()
+        self.particle_buffer.update()
 
     def update_fire_particles(self):
         for p in self.fire_particles:
             p.update()
 
     def draw_fire_particles(self):
+        if not self.fire_particles:  # an empty fire layer is fully transparent, skip the full-screen blit
+            return
         self.surface.fill((0, 0, 0, 0))
         for p in self.fire_particles:
             p.draw(self.surface)
@@ -311,11 +365,30 @@ class ParticleManager:
         s.blit(pygame.transform.scale(self.surface, (utils.world_size[0], utils.world_size[1]), self.dest_surf), (0, 0))
 
     def add_particle(self, particle):
-        self.particle_list.append(particle)
+        if self.vectorized and getattr(particle, 'preset', None):
+            if particle.life != 0:  # dead on arrival, e.g. most Dust
+                self.particle_buffer.emit(particle.preset, particle.x, particle.y, 1, *particle.preset_velocity())
+            pool.release(particle)  # only its parameters were needed
+        else:
+            self.particle_list.append(particle)
+
+    def remove_particle(self, particle):
+        self.particle_list.remove(particle)
+        if isinstance(particle, Particle):
+            pool.release(particle)
+
+    def emit(self, preset, x, y, count=1, vx=0.0, vy=0.0):
+        """Adds count particles of a ParticleBuffer preset, regardless of the vectorized setting"""
+        self.particle_buffer.emit(preset, x, y, count, vx, vy)
 
     def add_fire_particle(self, particle):
         self.fire_particles.append(particle)
 
+    def remove_fire_particle(self, particle):
+        self.fire_particles.remove(particle)
+        pool.release(particle)
+
     def draw_particles(self, surface):
         for particle in self.particle_list:
             particle.draw(surface)
+        self.particle_buffer.draw(surface)
@@ -2,6 +2,8 @@ import pygame
 from math import sqrt
 from entity import Entity
 from particles import Dust
+from pool import pool
+import utils as utils
 
 
 class Player(Entity):
@@ -30,7 +32,7 @@ class Player(Entity):
         self.fall(-100)
 
     def input(self):
-        pressed = pygame.key.get_pressed()
+        pressed = self.game.controls.pressed
         if pressed[pygame.K_w]:
             self.direction = 'up'
         if pressed[pygame.K_s]:
@@ -39,11 +41,11 @@ class Player(Entity):
             self.direction = 'left'
         if pressed[pygame.K_d]:
             self.direction = 'right'
-        if pressed[pygame.K_e] and pygame.time.get_ticks() - self.time > 300:
-            self.time = pygame.time.get_ticks()
+        if pressed[pygame.K_e] and utils.get_ticks() - self.time > 300:
+            self.time = utils.get_ticks()
             self.game.object_manager.interact()
-        if pressed[pygame.K_q] and self.weapon and pygame.time.get_ticks() - self.time > 300:
-            self.time = pygame.time.get_ticks()
+        if pressed[pygame.K_q] and self.weapon and utils.get_ticks() - self.time > 300:
+            self.time = utils.get_ticks()
             self.weapon.drop()
             if self.items:
                 self.weapon = self.items[0]
@@ -52,7 +54,7 @@ class Player(Entity):
             self.game.mini_map.draw_mini_map = False
         else:
             self.game.mini_map.draw_mini_map = True
-        for event in pygame.event.get():
+        for event in self.game.controls.events:
             if event.type == pygame.MOUSEBUTTONDOWN and self.items:
                 if event.button == 4:
                     self.weapon = self.items[self.items.index(self.weapon) - 1]
@@ -85,9 +87,9 @@ class Player(Entity):
         else:
             self.set_velocity(vel_list)
 
-        if pygame.mouse.get_pressed()[0] and pygame.time.get_ticks() - self.time > self.attack_cooldown \
+        if self.game.controls.mouse_buttons[0] and utils.get_ticks() - self.time > self.attack_cooldown \
                 and self.weapon:
-            self.time = pygame.time.get_ticks()
+            self.time = utils.get_ticks()
             self.attacking = True
             if self.weapon.name != 'staff':
                 self.weapon.weapon_swing.swing_side *= (-1)
@@ -107,7 +109,7 @@ class Player(Entity):
 
     def add_walking_particles(self):
         if self.moving():
-            self.game.particle_manager.add_particle(Dust(self.game, self, *self.rect.midbottom))
+            self.game.particle_manager.add_particle(pool.acquire(Dust, self.game, self, *self.rect.midbottom))
 
     def update(self) -> None:
         if self.falling:
@@ -132,10 +134,10 @@ class Player(Entity):
     def calculate_collision(self, enemy):
         if not self.shield and not self.dead:
             self.hp -= enemy.damage
-            self.game.sound_manager.play(self.game.sound_manager.player_hurt)
+            self.game.sound_manager.play('player_hurt')
             if not self.dead:
                 self.hurt = True
-            self.entity_animation.hurt_timer = pygame.time.get_ticks()
+            self.hurt_timer = utils.get_ticks()
         if self.shield:
             self.shield -= 1
 
@@ -0,0 +1,41 @@
+class ObjectPool:
+    """Free lists of released instances per class, reused by acquire instead of building new objects.
+
+    A pooled class builds its one time state (images, helper objects) in __init__ and puts everything else in a
+    reset method taking the constructor arguments, __init__ ends by calling it. acquire calls reset on a reused
+    instance, so it comes back in the state a new one would have. Release an object only once nothing refers to it."""
+
+    def __init__(self, max_free=256):
+        self.max_free = max_free  # released instances kept per class, the rest are left to the garbage collector
+        self.free = {}  # class -> released instances
+        self.hits = {}  # class name -> acquires served from the free list
+        self.misses = {}  # class name -> acquires that built a new instance
+
+    def acquire(self, cls, *args, **kwargs):
+        free = self.free.get(cls)
+        name = cls.__name__
+        if free:
+            self.hits[name] = self.hits.get(name, 0) + 1
+            obj = free.pop()
+            obj.reset(*args, **kwargs)
+            return obj
+        self.misses[name] = self.misses.get(name, 0) + 1
+        return cls(*args, **kwargs)
+
+    def release(self, obj):
+        free = self.free.setdefault(type(obj), [])
+        if len(free) < self.max_free:
+            free.append(obj)
+
+    def stats(self):
+        names = sorted(set(self.hits) | set(self.misses))
+        free = {cls.__name__: len(objects) for cls, objects in self.free.items()}
+        return {'hits': sum(self.hits.values()), 'misses': sum(self.misses.values()),
+                'classes': {name: {'hits': self.hits.get(name, 0), 'misses': self.misses.get(name, 0),
+                                   'free': free.get(name, 0)} for name in names}}
+
+    def clear(self):
+        self.free.clear()
+
+
+pool = ObjectPool()
@@ -0,0 +1,167 @@
+import csv
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+import numpy
+import pygame
+from text_renderer import text_renderer
+from pool import pool
+
+null_scope = nullcontext()
+
+
+class Scope:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.start, time.perf_counter())
+
+
+class Profiler:
+    """Named timing scopes around the subsystem calls of a frame, with a rolling history of durations per scope"""
+
+    def __init__(self, history=600, enabled=False):
+        self.enabled = enabled
+        self.history = history  # samples kept per scope, None keeps all of them
+        self.samples = {}  # scope name -> deque of durations in ms
+        self.scopes = {}
+        self.trace = deque(maxlen=history and history * 32)  # (name, start, end) in perf_counter seconds
+
+    def scope(self, name):
+        if not self.enabled:
+            return null_scope
+        scope = self.scopes.get(name)
+        if scope is None:
+            scope = self.scopes[name] = Scope(self, name)
+            self.samples[name] = deque(maxlen=self.history)
+        return scope
+
+    def add(self, name, start, end):
+        self.samples[name].append((end - start) * 1000)
+        self.trace.append((name, start, end))
+
+    def percentiles(self, name, percents=(50, 95, 99)):
+        return numpy.percentile(self.samples[name], percents)
+
+    def report(self):
+        lines = [f'{"scope":<40}{"p50":>9}{"p95":>9}{"p99":>9} ms']
+        for name, samples in self.samples.items():
+            if samples:
+                lines.append(f'{name:<40}' + ''.join(f'{value:9.3f}' for value in self.percentiles(name)))
+        return '\n'.join(lines)
+
+    def export_csv(self, path):
+        """One row per frame, one column of ms per scope, scopes are aligned on the latest frame"""
+        names = list(self.samples)
+        length = max((len(samples) for samples in self.samples.values()), default=0)
+        columns = [[''] * (length - len(self.samples[name])) + list(self.samples[name]) for name in names]
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['sample'] + names)
+            for sample, row in enumerate(zip(*columns)):
+                writer.writerow([sample] + [value if value == '' else f'{value:.4f}' for value in row])
+
+    def export_chrome_trace(self, path):
+        """Trace Event Format JSON, open it in chrome://tracing or Perfetto"""
+        origin = min((start for _, start, _ in self.trace), default=0)
+        events = [{'name': name, 'ph': 'X', 'pid': 1, 'tid': 1,
+                   'ts': (start - origin) * 1e6, 'dur': (end - start) * 1e6} for name, start, end in self.trace]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def clear(self):
+        self.samples = {}
+        self.scopes = {}
+        self.trace.clear()
+
+
+class ProfilerOverlay:
+    """Toggled with F3: stacked frame time graph of the profiled scopes, entity counts and frame percentiles"""
+    graph_size = (300, 100)
+    bar_width = 2
+    ms_height = 3  # graph pixels per ms
+    text_interval = 30  # frames between text refreshes, numbers change every frame and would churn the text cache
+    colors = [(230, 25, 75), (60, 180, 75), (255, 225, 25), (0, 130, 200), (245, 130, 48), (145, 30, 180),
+              (70, 240, 240), (240, 50, 230), (210, 245, 60), (250, 190, 212), (0, 128, 128), (220, 190, 255),
+              (170, 110, 40), (255, 250, 200), (128, 0, 0), (170, 255, 195), (128, 128, 0), (255, 215, 180)]
+
+    def __init__(self, game, position=(10, 10)):
+        self.game = game
+        self.position = position
+        self.visible = False
+        self.graph = pygame.Surface(self.graph_size).convert()
+        self.graph.set_alpha(200)
+        self.scope_colors = {}
+        self.lines = []
+        self.counter = 0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.game.profiler.enabled = self.visible
+        self.graph.fill((0, 0, 0))
+        self.counter = 0
+
+    def color(self, name):
+        if name not in self.scope_colors:
+            self.scope_colors[name] = self.colors[len(self.scope_colors) % len(self.colors)]
+        return self.scope_colors[name]
+
+    def update_graph(self):
+        """Scrolls the graph and draws only the newest frame's bar"""
+        width, height = self.graph_size
+        self.graph.scroll(-self.bar_width, 0)
+        self.graph.fill((0, 0, 0), (width - self.bar_width, 0, self.bar_width, height))
+        y = height
+        for name, samples in self.game.profiler.samples.items():
+            if name != 'frame' and samples:  # frame encloses the other scopes
+                bar_height = samples[-1] * self.ms_height
+                self.graph.fill(self.color(name), (width - self.bar_width, y - bar_height, self.bar_width, bar_height))
+                y -= bar_height
+        budget_y = height - 1000 / self.game.fps * self.ms_height  # frame budget line
+        self.graph.fill((255, 255, 255), (width - self.bar_width, budget_y, self.bar_width, 1))
+
+    def counts(self):
+        game = self.game
+        particle_manager = game.particle_manager
+        return (len(game.world_manager.current_room.enemy_list),
+                len(particle_manager.particle_list) + particle_manager.particle_buffer.count,
+                len(game.bullet_manager.bullets))
+
+    def update_text(self):
+        profiler = self.game.profiler
+        lines = ['enemies {}  particles {}  bullets {}'.format(*self.counts())]
+        lines.append('pool hits {hits}  misses {misses}'.format(**pool.stats()))
+        if profiler.samples.get('frame'):
+            lines.append('frame p50 {:.2f}  p95 {:.2f}  p99 {:.2f} ms'.format(*profiler.percentiles('frame')))
+        slowest = sorted((name for name in profiler.samples if name != 'frame' and profiler.samples[name]),
+                         key=lambda name: -profiler.percentiles(name, 50))
+        for name in slowest[:6]:
+            lines.append((name, '{}  {:.2f} / {:.2f} / {:.2f}'.format(name, *profiler.percentiles(name))))
+        self.lines = lines
+
+    def draw(self, surface):
+        if not self.visible:
+            return
+        self.update_graph()
+        if self.counter % self.text_interval == 0:
+            self.update_text()
+        self.counter += 1
+        x, y = self.position
+        surface.blit(self.graph, (x, y))
+        y += self.graph_size[1] + 4
+        for line in self.lines:
+            if isinstance(line, tuple):  # scope line with its graph color
+                name, line = line
+                surface.fill(self.color(name), (x, y + 3, 8, 8))
+                surface.blit(text_renderer.render(line, 14), (x + 12, y))
+            else:
+                surface.blit(text_renderer.render(line, 14), (x, y))
+            y += 16
@@ -0,0 +1,44 @@
+import random
+import numpy
+
+
+class RandomManager:
+    """Independent random streams per subsystem, all derived from one seed.
+
+    Gameplay draws from worldgen, loot and ai, particles and background effects from cosmetic, so adding or
+    removing an effect never shifts the dungeon, the drops or the fights of a seeded run."""
+    stream_names = ('worldgen', 'loot', 'ai', 'cosmetic')
+
+    def __init__(self, seed=None):
+        self.seed_value = None
+        self.worldgen = random.Random()  # room layout, room types, floor tiles, enemy placement
+        self.loot = random.Random()  # chest and enemy drops, dropped item bounces
+        self.ai = random.Random()  # enemy speeds and destinations, reflected bullets
+        self.cosmetic = random.Random()  # particles, background, animation jitter
+        self.numpy_streams = {}
+        self.seed(seed)
+
+    def stream(self, name):
+        return getattr(self, name)
+
+    def numpy_stream(self, name):
+        """numpy Generator for the stream, for code that samples arrays"""
+        if name not in self.numpy_streams:
+            self.numpy_streams[name] = numpy.random.default_rng(self.numpy_seed(name))
+        return self.numpy_streams[name]
+
+    def numpy_seed(self, name):
+        return [self.seed_value, self.stream_names.index(name)]
+
+    def seed(self, seed=None):
+        """Reseeds every stream in place, a random seed is picked when none is given"""
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
+        self.seed_value = int(seed)
+        for name in self.stream_names:
+            self.stream(name).seed(f'{self.seed_value}:{name}')
+        for name, generator in self.numpy_streams.items():  # keep the Generator objects handed out so far
+            generator.bit_generator.state = numpy.random.PCG64(self.numpy_seed(name)).state
+
+
+rng = RandomManager()
@@ -0,0 +1,66 @@
+"""Input record and replay, the standard workload for repeatable performance runs.
+
+python replay.py record session.rec --seed 7     play normally, inputs are saved when the game closes
+python replay.py play session.rec                 replay headless and print frame time percentiles per subsystem
+python replay.py play session.rec --window        replay in a window at the normal frame rate
+python replay.py play session.rec --csv frames.csv --trace trace.json
+"""
+import argparse
+import os
+import time
+
+
+def record(path, seed=None):
+    from controls import InputRecorder, LiveInput
+    from game import Game
+    recorder = InputRecorder(LiveInput())
+    game = Game(controls=recorder, seed=seed)
+    recorder.game = game
+    try:
+        game.run_game()
+    finally:  # closing the window ends the session with a pygame error, the inputs up to it are kept
+        recorder.save(path)
+        print(f'recorded {len(recorder.frames)} frames with seed {recorder.seed} to {path}')
+
+
+def replay(path, window=False, draw=True, csv_path=None, trace_path=None):
+    """Replays a recording and returns the game, its profiler holds the timings of every frame"""
+    if not window:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'  # must be set before pygame is initialised by importing game
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    from controls import ReplayInput
+    from game import Game
+    from profiler import Profiler
+    controls = ReplayInput(path)
+    game = Game(headless=not window, controls=controls, seed=controls.seed)
+    game.profiler = Profiler(history=None, enabled=True)
+    start = time.perf_counter()
+    frames = game.run_headless(len(controls), draw=draw, present=window)
+    elapsed = time.perf_counter() - start
+    print(f'replayed {frames} frames with seed {controls.seed} in {elapsed:.2f} s')
+    print(game.profiler.report())
+    if csv_path:
+        game.profiler.export_csv(csv_path)
+    if trace_path:
+        game.profiler.export_chrome_trace(trace_path)
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('mode', choices=('record', 'play'))
+    parser.add_argument('path')
+    parser.add_argument('--seed', type=int, default=None, help='dungeon seed of a new recording')
+    parser.add_argument('--window', action='store_true', help='replay in a window instead of headless')
+    parser.add_argument('--no-draw', action='store_true', help='replay updates only, without rendering')
+    parser.add_argument('--csv', help='write the per-frame scope timings of a replay to this file')
+    parser.add_argument('--trace', help='write a Chrome trace JSON of a replay to this file')
+    args = parser.parse_args()
+    if args.mode == 'record':
+        record(args.path, args.seed)
+    else:
+        replay(args.path, args.window, not args.no_draw, args.csv, args.trace)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import os
+import pygame
+
+
+class SoundManager:
+    """Decodes every sample once and plays them through a fixed pool of mixer channels.
+
+    When all channels are busy a new sound takes over the channel playing the least important, oldest sound,
+    as long as that sound's priority is not higher than its own; otherwise the new sound is dropped."""
+    path = 'src/assets/sound'
+    samples = {
+        'shoot': 'Shoot5.wav',
+        'impact': 'Impact5.wav',
+        'hit': 'Hit.wav',
+        'bounce': 'Hit.wav',
+        'magic': 'Magic1.wav',
+        'coin': 'Coin.wav',
+        'player_hurt': 'Hurt.wav',
+        'drop': 'Drop.wav',
+        'drop_items': 'Drop.wav',
+        'sword_fire': 'Sword.wav',
+        'game_over': 'GameOver.wav',
+    }
+    priorities = {  # higher wins when channels run out
+        'player_hurt': 3,
+        'game_over': 3,
+        'hit': 2,
+        'bounce': 2,
+        'magic': 2,
+        'sword_fire': 1,
+        'shoot': 1,
+        'drop': 1,
+        'drop_items': 1,
+        'impact': 0,
+        'coin': 0,
+    }
+
+    def __init__(self, game, channels=16):
+        self.game = game
+        self.sounds = {}  # name -> pygame.mixer.Sound, or None if the file is missing
+        self.enabled = bool(pygame.mixer.get_init())
+        self.channels = []
+        if self.enabled:
+            pygame.mixer.set_num_channels(channels)
+            pygame.mixer.set_reserved(channels)  # keep pygame's own channel allocation out of the pool
+            self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.channel_priority = [0] * len(self.channels)
+        self.channel_started = [0] * len(self.channels)
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def load(self, name):
+        if name not in self.sounds:
+            path = os.path.join(self.path, self.samples.get(name, name))
+            self.sounds[name] = pygame.mixer.Sound(path) if self.enabled and os.path.isfile(path) else None
+        return self.sounds[name]
+
+    def preload(self):
+        for name in self.samples:
+            self.load(name)
+
+    def find_channel(self, priority):
+        stolen = None
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return index
+            if self.channel_priority[index] <= priority and (
+                    stolen is None
+                    or (self.channel_priority[index], self.channel_started[index])
+                    < (self.channel_priority[stolen], self.channel_started[stolen])
+            ):
+                stolen = index
+        return stolen
+
+    def play(self, name, priority=None):
+        sound = self.load(name)
+        if sound is None:
+            return None
+        if priority is None:
+            priority = self.priorities.get(name, 1)
+        index = self.find_channel(priority)
+        if index is None:
+            self.dropped += 1
+            return None
+        channel = self.channels[index]
+        if channel.get_busy():
+            self.stolen += 1
+        channel.play(sound)
+        self.channel_priority[index] = priority
+        self.channel_started[index] = pygame.time.get_ticks()
+        self.played += 1
+        return channel
+
+    def play_hit_sound(self):
+        self.play('hit')
+
+    def play_drop_sound(self):
+        self.play('drop')
+
+    def play_drop_items_sound(self):
+        self.play('drop_items')
+
+    def play_sword_sound(self, kind):
+        self.play(f'sword_{kind}')
+
+    def stop(self):
+        for channel in self.channels:
+            channel.stop()
+
+    def stats(self):
+        return {'samples': sum(sound is not None for sound in self.sounds.values()), 'played': self.played,
+                'stolen': self.stolen, 'dropped': self.dropped}
@@ -0,0 +1,35 @@
+class SpatialHash:
+    """Buckets items by the grid cells their rect overlaps, so nearby items can be found without a full scan"""
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.order = {}  # id(item) -> insertion index, keeps query results in insertion order
+
+    def clear(self):
+        self.cells.clear()
+        self.order.clear()
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        for x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield x, y
+
+    def insert(self, item, rect):
+        self.order[id(item)] = len(self.order)
+        for cell in self.cell_range(rect):
+            self.cells.setdefault(cell, []).append(item)
+
+    def query(self, rect):
+        """Returns items sharing a cell with rect, in insertion order"""
+        size = self.cell_size
+        left, top, width, height = rect
+        x, y = left // size, top // size
+        if x == (left + width - 1) // size and y == (top + height - 1) // size:
+            return list(self.cells.get((x, y), ()))  # common case, a single cell is already ordered
+        found = {}
+        for cell in self.cell_range(rect):
+            for item in self.cells.get(cell, ()):
+                found[id(item)] = item
+        return sorted(found.values(), key=lambda item: self.order[id(item)])
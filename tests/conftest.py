@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # assets are loaded by paths relative to the project root
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+
+@pytest.fixture
+def room_maps(monkeypatch):
+    """Points the room templates at the small layers of tests/maps, maps/ is not part of the repository"""
+    from map_generator import room_templates
+    monkeypatch.setattr(room_templates, 'path', os.path.join(ROOT, 'tests', 'maps'))
@@ -0,0 +1,20 @@
+import pygame
+
+from asset_manager import assets
+from utils import get_mask_rect
+
+
+def test_mask_rect_of_loaded_image_is_cached():
+    image = assets.image('src/assets/objects/coin/coin.png', (16, 16))
+    assert assets.mask_rect(image, 10, 20) == get_mask_rect(image, 10, 20)
+    assert image in assets.mask_rects
+    assert assets.mask_rect(image, 3, 4) == get_mask_rect(image, 3, 4)
+
+
+def test_mask_rect_of_other_surface_follows_drawing():
+    surface = pygame.Surface((20, 20), pygame.SRCALPHA)
+    surface.fill((255, 0, 0, 255), (2, 2, 4, 4))
+    assert assets.mask_rect(surface) == pygame.Rect(2, 2, 4, 4)
+    surface.fill((255, 0, 0, 255), (10, 10, 6, 6))
+    assert assets.mask_rect(surface) == pygame.Rect(2, 2, 14, 14)
+    assert surface not in assets.mask_rects
@@ -0,0 +1,33 @@
+import math
+
+import utils
+from controls import ScriptedInput
+from enemy import Enemy
+from game import Game
+
+
+class Chaser(Enemy):
+    """An enemy with the stock update and move, as the Demon the tree refers to would be"""
+    damage = 10
+    speed = 250  # until change_speed picks one
+
+
+def test_steered_enemies_move_at_this_ticks_speed(room_maps):
+    game = Game(headless=True, controls=ScriptedInput([(set(), (640, 400), (False, False, False))]), seed=1)
+    game.enemy_manager.batched = True
+    room = game.world_manager.current_room
+    room.enemy_list = [Chaser(game, 100, room, 'bat') for _ in range(8)]
+    for enemy in room.enemy_list:
+        enemy.spawn()
+    game.dt = 1 / 60
+    speeds = []
+    try:
+        for tick in range(200):  # change_speed picks a new speed every 1.5 s
+            utils.simulated_ticks = tick * 17
+            game.enemy_manager.update_enemies()
+            speeds += [(math.hypot(*enemy.velocity), enemy.speed * game.dt) for enemy in room.enemy_list
+                       if any(enemy.velocity)]
+    finally:
+        utils.simulated_ticks = None
+    assert speeds
+    assert all(math.isclose(moved, speed) for moved, speed in speeds)
@@ -0,0 +1,22 @@
+import pygame
+
+from map import TileMap
+
+
+def drawn_map(layered, frames=3):
+    """A floor tile next to an empty one, with red drawn over both every frame and cleared again"""
+    tile_map = TileMap(None, [[[129, 0], [0, 129]]], layered=layered)
+    tile_map.materialize()
+    for frame in range(frames):
+        surface = tile_map.map_surface
+        surface.fill((200, 0, 0), (0, 0, 200, 200))
+        surface.blit(pygame.Surface((30, 30)), (frame * 10, 60))  # black over black as well
+        tile_map.clear_map()
+    return tile_map.map_surface
+
+
+def test_layered_restore_matches_copy():
+    layered, copied = drawn_map(True), drawn_map(False)
+    assert pygame.image.tobytes(layered, 'RGB') == pygame.image.tobytes(copied, 'RGB')
+    assert layered.get_at((5, 5))[:3] == (0, 0, 0)
+    assert layered.get_colorkey() == copied.get_colorkey()
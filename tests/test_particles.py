@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import numpy
+import pytest
+
+from particle_buffer import ParticleBuffer
+from particles import ParticleManager, EnemyHitParticle, WallHitParticle, StaffParticle, Dust
+
+player = SimpleNamespace(velocity=[1, 0])
+kinds = {
+    'enemy_hit': (lambda game: EnemyHitParticle(game, 100, 100), 'radius', [3, 4, 5, 6, 7, 8]),
+    'wall_hit': (lambda game: WallHitParticle(game, 100, 100), 'radius', [10, 10]),
+    'staff': (lambda game: StaffParticle(game, 100, 100, None), 'radius', [7, 8]),
+    'dust': (lambda game: Dust(game, player, 100, 100), 'life', [4, 5]),
+}
+
+
+def alive_per_tick(update, alive):
+    counts = []
+    while alive():
+        update()
+        counts.append(alive())
+    return counts
+
+
+@pytest.mark.parametrize('preset', kinds)
+def test_buffer_particles_live_as_long_as_objects(preset):
+    make, field, starts = kinds[preset]
+    game = SimpleNamespace()
+    game.particle_manager = manager = ParticleManager(game)
+    for start in starts:
+        particle = make(game)
+        setattr(particle, field, start)
+        manager.particle_list.append(particle)
+    objects = alive_per_tick(manager.update_particles, lambda: len(manager.particle_list))
+
+    buffer = ParticleBuffer(rng=numpy.random.default_rng(1))
+    buffer.emit(preset, 100, 100, len(starts))
+    getattr(buffer, field)[:len(starts)] = starts
+    assert alive_per_tick(buffer.update, lambda: len(buffer)) == objects
+
+
+def test_buffer_jitter_is_whole_steps():
+    buffer = ParticleBuffer(rng=numpy.random.default_rng(1))
+    buffer.emit('enemy_hit', 100, 100, 50)
+    buffer.emit('dust', 100, 100, 50)
+    buffer.update()
+    assert set(buffer.x[:50] - 100) <= {-1, 0, 1}
+    assert set((buffer.y[50:100] - 100) * 4) <= {-3, -2, -1, 0, 1, 2}
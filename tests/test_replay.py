@@ -0,0 +1,53 @@
+import pygame
+
+import utils
+from controls import InputRecorder, ReplayInput, ScriptedInput
+from game import Game
+from random_manager import rng
+
+
+def snapshot(game):
+    room = game.world_manager.current_room
+    return {'ticks': utils.get_ticks(), 'game_time': game.game_time, 'dt': game.dt,
+            'player': tuple(game.player.rect), 'hp': game.player.hp, 'room': (room.x, room.y),
+            'enemies': [tuple(enemy.rect) for enemy in room.enemy_list], 'ai': rng.ai.getstate()}
+
+
+def test_replay_reproduces_recording(tmp_path, room_maps, frames=90):
+    path = str(tmp_path / 'session.rec')
+    states = []
+
+    def script(frame):
+        if frame == frames - 1:
+            game.running = False  # ends run_game after this frame
+        keys = {pygame.K_d} if frame < 45 else {pygame.K_s, pygame.K_a}
+        return keys, (700, 300 + frame), (frame % 30 == 0, False, False)
+
+    recorder = InputRecorder(ScriptedInput(script))
+    game = Game(controls=recorder, seed=5)
+    recorder.game = game
+    game.menu.running = False
+    update_groups = game.update_groups
+
+    def recorded_update():
+        update_groups()
+        states.append(snapshot(game))
+    game.update_groups = recorded_update
+    game.run_game()
+    recorder.save(path)
+    assert utils.simulated_ticks is None
+
+    pygame.init()
+    controls = ReplayInput(path)
+    replayed = Game(headless=True, controls=controls, seed=controls.seed)
+    replayed_states = []
+    update_groups = replayed.update_groups
+
+    def replayed_update():
+        update_groups()
+        replayed_states.append(snapshot(replayed))
+    replayed.update_groups = replayed_update
+    replayed.run_headless(len(controls), draw=True)
+    assert utils.simulated_ticks is None
+    assert len(replayed_states) == frames
+    assert replayed_states == states
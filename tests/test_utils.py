@@ -0,0 +1,19 @@
+import pygame
+
+import utils
+
+
+def test_cropped_shadow_draws_the_same_pixels():
+    dimension, ellipse, scale, color = 50, (0, 0, 5, 3), 2, (0, 0, 0, 120)
+    full = pygame.Surface((dimension, dimension), pygame.SRCALPHA).convert_alpha()
+    pygame.draw.ellipse(full, color, ellipse)
+    full = pygame.transform.scale(full, (scale * dimension, scale * dimension))
+    cropped = utils.shadow_sprite(dimension, ellipse, scale, color)
+    assert cropped.get_width() < full.get_width()
+    drawn = []
+    for shadow in (full, cropped):
+        surface = pygame.Surface((120, 120))
+        surface.fill((90, 160, 30))
+        surface.blit(shadow, (7, 9))
+        drawn.append(pygame.image.tobytes(surface, 'RGB'))
+    assert drawn[0] == drawn[1]
@@ -0,0 +1,30 @@
+import pytest
+
+import utils
+from controls import ScriptedInput
+from enemy import Imp
+from game import Game
+from pool import pool
+from weapon import ImpBullet
+
+
+@pytest.mark.parametrize('batched', [False, True])
+def test_imp_bullet_hits_player(room_maps, batched):
+    game = Game(headless=True, controls=ScriptedInput([(set(), (640, 400), (False, False, False))]), seed=3)
+    game.bullet_manager.batched = batched
+    room = game.world_manager.current_room
+    room.enemy_list = []
+    imp = Imp(game, 10, 100, room)
+    player = game.player
+    player.shield = 0
+    x, y = player.hitbox.center
+    hp = player.hp
+    game.bullet_manager.add_bullet(pool.acquire(ImpBullet, game, imp, room, x - 4, y - 4, (x + 100, y)))
+    utils.simulated_ticks = 1234
+    try:
+        game.bullet_manager.update()
+    finally:
+        utils.simulated_ticks = None
+    assert player.hp == hp - imp.damage
+    assert player.hurt and player.hurt_timer == 1234
+    assert not game.bullet_manager.bullets
@@ -0,0 +1,39 @@
+import pygame
+import utils as utils
+
+
+class TextRenderer:
+    """Caches Font objects per size and rendered text surfaces per (text, size, color).
+
+    Progressive reveals (text[:counter]) render each prefix once and reuse it on later frames and objects.
+    Returned surfaces are shared, blit them but do not draw on them."""
+
+    def __init__(self, font=utils.font, max_surfaces=512):
+        self.font_path = font
+        self.fonts = {}
+        self.surfaces = {}
+        self.max_surfaces = max_surfaces
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size):
+        if size not in self.fonts:
+            self.fonts[size] = pygame.font.Font(self.font_path, size)
+        return self.fonts[size]
+
+    def render(self, text, size, color=(255, 255, 255), antialias=True):
+        key = (text, size, color, antialias)
+        if key in self.surfaces:
+            self.hits += 1
+        else:
+            self.misses += 1
+            if len(self.surfaces) >= self.max_surfaces:
+                self.surfaces.clear()
+            self.surfaces[key] = self.font(size).render(text, antialias, color)
+        return self.surfaces[key]
+
+    def stats(self):
+        return {'fonts': len(self.fonts), 'surfaces': len(self.surfaces), 'hits': self.hits, 'misses': self.misses}
+
+
+text_renderer = TextRenderer()
@@ -50,6 +50,16 @@ def get_mask_rect(surf, top=0, left=0):
         return surf_mask_rect
 
 
+simulated_ticks = None  # milliseconds of simulated time, set by headless runs
+
+
+def get_ticks():
+    """Milliseconds since the game started, simulated time in headless runs"""
+    if simulated_ticks is None:
+        return pygame.time.get_ticks()
+    return simulated_ticks
+
+
 def wait(mil_sec, game):
     ticks = mil_sec / 16
     if game.counter == game.counter + ticks:
@@ -57,6 +67,30 @@ def wait(mil_sec, game):
 
 
 def time_passed(time, amount):
-    if pygame.time.get_ticks() - time > amount:
-        time = pygame.time.get_ticks()
+    if get_ticks() - time > amount:
+        time = get_ticks()
         return True
+
+
+shadow_cache = {}  # (dimension, ellipse rect, scale, color) -> shadow surface
+
+
+def shadow_sprite(dimension, ellipse, scale=2, color=(0, 0, 0, 120)):
+    """Returns a shared shadow: an ellipse drawn on a dimension x dimension surface, then scaled up by scale"""
+    ellipse = tuple(pygame.Rect(ellipse))  # pygame truncates float rects anyway, keeps the key space small
+    key = (dimension, ellipse, scale, color)
+    if key not in shadow_cache:
+        shape_surf = pygame.Surface((dimension, dimension), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.ellipse(shape_surf, color, ellipse)
+        shape_surf = pygame.transform.scale(shape_surf, (scale * dimension, scale * dimension))
+        # the transparent right and bottom of the square draw nothing, cut off they are not blitted or restored
+        used = shape_surf.get_bounding_rect()
+        shadow_cache[key] = shape_surf.subsurface((0, 0, used.right, used.bottom)).copy()
+    return shadow_cache[key]
+
+
+def mark_dirty(surface, rect):
+    """Reports a rect drawn with pygame.draw to surfaces that track dirty regions (see map.DirtySurface)"""
+    if hasattr(surface, 'mark_dirty'):
+        surface.mark_dirty(rect)
+    return rect
@@ -1,17 +1,40 @@
 import math
-import random
+import numpy
+from random_manager import rng
 import pygame
 from pygame.math import Vector2
 from utils import get_mask_rect
 from utils import *
-from PIL import Image
 from object import Object
 from particles import ParticleManager
 from particles import EnemyHitParticle, WallHitParticle, StaffParticle
 from player import Player
+from asset_manager import assets
+from pool import pool
 
 
 
+class RotationAtlas:
+    """Rotated copies of weapon images with their masks and mask bounding rects, built lazily per angle.
+
+    Angles are quantized to `step` degrees, so aiming and swinging become dictionary lookups."""
+
+    def __init__(self, step=2):
+        self.step = step
+        self.frames = {}  # (source image, quantized angle) -> (rotated image, mask, mask bounding rect)
+
+    def get(self, image, angle):
+        key = (image, round(angle / self.step) * self.step % 360)
+        if key not in self.frames:
+            rotated = pygame.transform.rotozoom(image, key[1], 1)
+            mask = pygame.mask.from_surface(rotated)
+            self.frames[key] = (rotated, mask, get_mask_rect(rotated) or rotated.get_rect())
+        return self.frames[key]
+
+    def clear(self):
+        self.frames.clear()
+
+
 class WeaponSwing:
     left_swing = 10
     right_swing = -190
@@ -26,12 +49,13 @@ class WeaponSwing:
         self.swing_side = 1
         self.image = f'src/assets/objects/weapon/{weapon}/{weapon}.png'
         self.rect = weapon.rect
+        self.rect_mask = None
 
     def reset(self):
         self.counter = 0
 
     def rotate(self, weapon=None):
-        mx, my = pygame.mouse.get_pos()
+        mx, my = self.weapon.game.controls.mouse_pos
         dx = mx - self.weapon.player.hitbox.centerx  # - 64
         dy = my - self.weapon.player.hitbox.centery  # - 32
         if self.swing_side == 1:
@@ -41,29 +65,33 @@ class WeaponSwing:
 
         position = self.weapon.player.hitbox.center
         if weapon:
-            self.weapon.image = pygame.transform.rotozoom(self.weapon.image, self.angle, 1)
+            self.set_rotated_image(self.weapon.image, position)
         else:
-            self.weapon.image = pygame.transform.rotozoom(self.weapon.original_image, self.angle, 1)
-
-        offset_rotated = self.offset.rotate(-self.angle)
-        self.weapon.rect = self.weapon.image.get_rect(center=position + offset_rotated)
-        self.weapon.hitbox = pygame.mask.from_surface(self.weapon.image)
+            self.set_rotated_image(self.weapon.original_image, position)
         self.offset_rotated = Vector2(0, -35).rotate(-self.angle)
 
     def swing(self):
         self.angle += 20 * self.swing_side
         position = self.weapon.player.hitbox.center
-        self.weapon.image = pygame.transform.rotozoom(self.weapon.original_image, self.angle, 1)
+        self.set_rotated_image(self.weapon.original_image, position)
+        self.rect_mask = self.weapon.mask_rect.move(self.weapon.rect.topleft)
+        self.counter += 1
+
+    def set_rotated_image(self, image, position):
+        self.weapon.image, self.weapon.mask, self.weapon.mask_rect = self.weapon.rotation_atlas.get(image, self.angle)
+        self.weapon.rotated_image = self.weapon.image
         offset_rotated = self.offset.rotate(-self.angle)
         self.weapon.rect = self.weapon.image.get_rect(center=position + offset_rotated)
-        self.rect_mask = get_mask_rect(self.image, *self.rect.topleft)
-        self.weapon.hitbox = pygame.mask.from_surface(self.weapon.image)
-        self.counter += 1
+        self.weapon.hitbox = self.weapon.mask
 
 
 class Weapon(Object):
     def __init__(self, game, name=None, size=None, room=None, position=None):
         self.scale = 3
+        self.rotation_atlas = RotationAtlas()
+        self.flipped_image = None
+        self.rotated_image = None
+        self.mask_rect = None
         Object.__init__(self, game, name, 'weapon', size, room, position)
         self.size = size
         self.player = None
@@ -76,13 +104,28 @@ class Weapon(Object):
 
     def load_image(self):
         """Load weapon image and initialize instance variables"""
-        self.size = tuple(self.scale * x for x in Image.open(f'src/assets/objects/weapon/{self.name}/{self.name}.png').size)
-        self.original_image = pygame.image.load(f'src/assets/objects/weapon/{self.name}/{self.name}.png').convert_alpha()
-        self.original_image = pygame.transform.scale(self.original_image, self.size)
+        path = f'src/assets/objects/weapon/{self.name}/{self.name}.png'
+        self.size = tuple(self.scale * x for x in assets.image(path).get_size())
+        self.original_image = assets.image(path, self.size)
+        self.mask = assets.mask(path, self.size)  # mask of the current image, used by pygame.sprite.collide_mask
+        self.flipped_image = None
         self.image = self.original_image
         self.rect = self.image.get_rect()
         self.hitbox = get_mask_rect(self.original_image, *self.rect.topleft)
 
+    def flip_image(self):
+        """Mirrors original_image, keeping both sides so their rotations stay in the atlas"""
+        if self.flipped_image is None:
+            self.flipped_image = pygame.transform.flip(self.original_image, 1, 0)
+        self.original_image, self.flipped_image = self.flipped_image, self.original_image
+
+    def update_hitbox(self):
+        if self.image is self.rotated_image:  # mask rect comes with the atlas frame
+            self.hitbox = self.mask_rect.copy()
+            self.hitbox.midbottom = self.rect.midbottom
+        else:
+            Object.update_hitbox(self)
+
     def detect_collision(self):
         if self.game.player.hitbox.colliderect(self.rect):
             self.interaction = True
@@ -119,7 +162,7 @@ class Weapon(Object):
         self.weapon_swing.offset_rotated = Vector2(0, -25)
 
     def enemy_collision(self):
-        for enemy in self.game.enemy_manager.enemy_list:
+        for enemy in self.game.enemy_manager.enemies_near(self.game.player.weapon.rect):
             if (
                     pygame.sprite.collide_mask(self.game.player.weapon, enemy)
                     and enemy.dead is False
@@ -128,14 +171,14 @@ class Weapon(Object):
                 self.game.player.weapon.special_effect(enemy)
                 enemy.hurt = True
                 enemy.hp -= self.game.player.weapon.damage * self.game.player.strength
-                enemy.entity_animation.hurt_timer = pygame.time.get_ticks()
+                enemy.hurt_timer = get_ticks()
                 self.game.sound_manager.play_hit_sound()
-                enemy.weapon_hurt_cooldown = pygame.time.get_ticks()
+                enemy.weapon_hurt_cooldown = get_ticks()
 
     def player_update(self):
         self.interaction = False
         if self.weapon_swing.counter == 10:
-            self.original_image = pygame.transform.flip(self.original_image, 1, 0)
+            self.flip_image()
             self.player.attacking = False
             self.weapon_swing.counter = 0
         if self.player.attacking and self.weapon_swing.counter <= 10:
@@ -189,33 +232,37 @@ class Shotgun(Weapon):
         self.load_images()
         self.firing_position = self.hitbox.topleft
         self.bullets = []
+        self.killed = []
         self.shadow.set_correct(3)
-        self.bullets = []
 
     def remove_bullets(self):
-        for bullet in self.bullets:
-            if self.game.world_manager.current_room is not bullet.room:
-                self.bullets.remove(bullet)
+        room = self.game.world_manager.current_room
+        for bullet in [bullet for bullet in self.bullets if bullet.room is not room]:
+            self.kill(bullet)
 
     def add_bullet(self, bullet):
         self.bullets.append(bullet)
 
     def kill(self, bullet):
-        self.bullets.remove(bullet)
+        if bullet in self.bullets:
+            self.bullets.remove(bullet)
+            self.killed.append(bullet)  # released to the pool once the bullets are updated, as in BulletManager
 
     def update(self):
         self.remove_bullets()
-        for bullet in self.bullets:
+        for bullet in self.bullets[:]:
             bullet.update()
+        for bullet in self.killed:
+            pool.release(bullet)
+        self.killed.clear()
 
     def draw(self):
         for bullet in self.bullets:
             bullet.draw()
 
     def load_images(self):
+        image = assets.image(f'src/assets/objects/weapon/{self.name}/{self.name}.png', self.size)
         for i in range(4):
-            image = pygame.image.load(f'src/assets/objects/weapon/{self.name}/{self.name}.png').convert_alpha()
-            image = pygame.transform.scale(image, self.size)
             self.images.append(image)
         self.image = self.images[0]
 
@@ -230,14 +277,14 @@ class Shotgun(Weapon):
             self.firing_position = (self.hitbox.bottomright[0], self.hitbox.bottomright[1] - 15)
 
     def fire(self):
-        pos = pygame.mouse.get_pos()
+        pos = self.game.controls.mouse_pos
         self.update_hitbox()
         self.calculate_firing_position()
-        self.add_bullet(ShotgunBullet(self.game, self, self.game.world_manager.current_room, self.firing_position[0], self.firing_position[1] - 15, pos))
+        self.add_bullet(pool.acquire(ShotgunBullet, self.game, self, self.game.world_manager.current_room, self.firing_position[0], self.firing_position[1] - 15, pos))
         self.calculate_firing_position()
-        self.add_bullet(ShotgunBullet(self.game, self, self.game.world_manager.current_room, self.firing_position[0],self.firing_position[1], pos))
+        self.add_bullet(pool.acquire(ShotgunBullet, self.game, self, self.game.world_manager.current_room, self.firing_position[0],self.firing_position[1], pos))
         self.calculate_firing_position()
-        self.add_bullet(ShotgunBullet(self.game, self, self.game.world_manager.current_room, self.firing_position[0],self.firing_position[1] + 15, pos))
+        self.add_bullet(pool.acquire(ShotgunBullet, self.game, self, self.game.world_manager.current_room, self.firing_position[0],self.firing_position[1] + 15, pos))
 
     def player_update(self):
         self.interaction = False
@@ -285,22 +332,28 @@ class Revolver(Weapon):
         self.damage_enemies = []
         self.shadow.set_correct(-3)
         self.bullets = []
+        self.killed = []
 
     def remove_bullets(self):
-        for bullet in self.bullets:
-            if self.game.world_manager.current_room is not bullet.room:
-                self.bullets.remove(bullet)
+        room = self.game.world_manager.current_room
+        for bullet in [bullet for bullet in self.bullets if bullet.room is not room]:
+            self.kill(bullet)
 
     def add_bullet(self, bullet):
         self.bullets.append(bullet)
 
     def kill(self, bullet):
-        self.bullets.remove(bullet)
+        if bullet in self.bullets:
+            self.bullets.remove(bullet)
+            self.killed.append(bullet)  # released to the pool once the bullets are updated, as in BulletManager
 
     def update(self):
         self.remove_bullets()
-        for bullet in self.bullets:
+        for bullet in self.bullets[:]:
             bullet.update()
+        for bullet in self.killed:
+            pool.release(bullet)
+        self.killed.clear()
 
     def draw(self):
         for bullet in self.bullets:
@@ -317,10 +370,10 @@ class Revolver(Weapon):
             self.firing_position = (self.hitbox.bottomright[0], self.hitbox.bottomright[1])
 
     def fire(self):
-        pos = pygame.mouse.get_pos()
+        pos = self.game.controls.mouse_pos
         self.update_hitbox()
         self.calculate_firing_position()
-        self.game.bullet_manager.add_bullet(RevolverBullet(self.game, self, self.game.world_manager.current_room, self.firing_position[0], self.firing_position[1], pos))
+        self.game.bullet_manager.add_bullet(pool.acquire(RevolverBullet, self.game, self, self.game.world_manager.current_room, self.firing_position[0], self.firing_position[1], pos))
 
     def enemy_in_list(self, enemy):
         for e in self.damage_enemies:
@@ -337,7 +390,7 @@ class Revolver(Weapon):
     def player_update(self):
         self.interaction = False
         if self.weapon_swing.counter == 10:
-            self.original_image = pygame.transform.flip(self.original_image, 1, 0)
+            self.flip_image()
             self.player.attacking = False
             self.weapon_swing.counter = 0
             self.game.screen_position = (0, 0)
@@ -360,7 +413,7 @@ class DestroyerCannon(Weapon):
     def player_update(self):
         self.interaction = False
         if self.weapon_swing.counter == 10:
-            self.original_image = pygame.transform.flip(self.original_image, 1, 0)
+            self.flip_image()
             self.player.attacking = False
             self.weapon_swing.counter = 0
         if self.player.attacking and self.weapon_swing.counter <= 10:
@@ -391,7 +444,7 @@ class Katana(Weapon):
     def player_update(self):
         self.interaction = False
         if self.weapon_swing.counter == 10:
-            self.original_image = pygame.transform.flip(self.original_image, 1, 0)
+            self.flip_image()
             self.player.attacking = False
             self.weapon_swing.counter = 0
         if self.player.attacking and self.weapon_swing.counter <= 10:
@@ -422,7 +475,7 @@ class Armyknife(Weapon):
     def player_update(self):
         self.interaction = False
         if self.weapon_swing.counter == 10:
-            self.original_image = pygame.transform.flip(self.original_image, 1, 0)
+            self.flip_image()
             self.player.attacking = False
             self.weapon_swing.counter = 0
         if self.player.attacking and self.weapon_swing.counter <= 10:
@@ -453,7 +506,7 @@ class Bow(Weapon):
     def player_update(self):
         self.interaction = False
         if self.weapon_swing.counter == 10:
-            self.original_image = pygame.transform.flip(self.original_image, 1, 0)
+            self.flip_image()
             self.player.attacking = False
             self.weapon_swing.counter = 0
         if self.player.attacking and self.weapon_swing.counter <= 10:
@@ -473,31 +526,36 @@ class Bow(Weapon):
         self.update_hitbox()
 
 class Bullet():
-    def __init__(self, game, master, room, x, y, target):
+    __slots__ = ('game', 'player', 'master', 'room', 'image', 'rect', 'pos', 'dir', 'bounce_back', 'damage', 'speed',
+                 'killed')
+    bullet_speed = 0  # speed is per instance, a bounced bullet speeds up
+    deflectable = True  # the weapon swing can bounce it back at the enemies
+
+    def __init__(self, game, master, room, x, y, target, *args):
         super().__init__()
+        self.image = None
+        self.rect = None
+        self.load_image()
+        self.reset(game, master, room, x, y, target, *args)
+
+    def reset(self, game, master, room, x, y, target):
+        """Aims a new or pooled bullet, subclasses extend it instead of __init__, the image is kept"""
         self.game = game
         self.player = Player
         self.master = master
         self.room = room
-        self.image = None
-        self.rect = None
-        self.load_image()
         self.rect.x = x
         self.rect.y = y
         self.pos = (x, y)
         self.dir = pygame.math.Vector2(target[0] - x, target[1] - y)
         self.calculate_dir(self.player)
         self.bounce_back = True
+        self.speed = self.bullet_speed
+        self.killed = False  # the rest of the tick skips it, the pool gets it back once the tick is over
 
     def calculate_dir(self, player):
-        if 0 <= self.weapon_swing.angle < 90:
-            self.firing_position = self.hitbox.topleft
-        elif 90 <= self.weapon_swing.angle < 180:
-            self.firing_position = (self.hitbox.bottomleft[0], self.hitbox.bottomleft[1])
-        elif 0 > self.weapon_swing.angle > -90:
-            self.firing_position = self.hitbox.topright
-        else:
-            self.firing_position = (self.hitbox.bottomright[0], self.hitbox.bottomright[1])
+        if self.dir.length_squared() > 0:  # unit vector towards the target, update_position scales it by speed
+            self.dir.normalize_ip()
 
     def set_damage(self, value):
         self.damage = value
@@ -514,37 +572,43 @@ class Bullet():
             self.rect.y = self.pos[1]  #
 
     def kill(self):
-        if self in self.game.bullet_manager.bullets:
-            self.game.bullet_manager.bullets.remove(self)
-        self.game.sound_manager.play(pygame.mixer.Sound('assets/sound/Impact5.wav'))
+        if self.killed:
+            return
+        self.killed = True
+        self.game.bullet_manager.kill(self)
+        self.game.sound_manager.play('impact')
+
+    def hit_enemy(self):
+        for enemy in self.game.enemy_manager.enemies_near(self.rect):
+            if self.rect.colliderect(enemy.hitbox):
+                enemy.hp -= self.damage
+                self.game.particle_manager.add_particle(pool.acquire(EnemyHitParticle, self.game, self.rect.x, self.rect.y))
+                self.kill()
+                break
 
     def update(self):
         self.update_position()
-        if self.bounce_back is False:
-            for enemy in self.game.enemy_manager.enemy_list:
-                if self.rect.colliderect(enemy.hitbox):
-                    enemy.hp -= self.damage
-                    self.game.particle_manager.particle_list.append(EnemyHitParticle(self.game, self.rect.x, self.rect.y))
-                    self.kill()
-                    break
-        self.player_collision(self.game.player)
-        self.bounce()
-        if self.rect.y < 0 or self.rect.y > 1000 or self.rect.x < 0 or self.rect.x > 1300:
+        if self.bounce_back is False:  # bounced back by the weapon
+            self.hit_enemy()
+        if not self.killed:
+            self.player_collision(self.game.player)
+        if not self.killed:
+            self.bounce()
+        if not self.killed and (self.rect.y < 0 or self.rect.y > 1000 or self.rect.x < 0 or self.rect.x > 1300):
             self.kill()
-        self.wall_collision()
+        if not self.killed:
+            self.wall_collision()
 
     def draw(self):
         surface = self.master.room.tile_map.map_surface
-        pygame.draw.circle(surface, (255, 255, 255), (self.rect.x + self.radius / 2, self.rect.y + self.radius / 2),self.radius)
+        mark_dirty(surface, pygame.draw.circle(surface, (255, 255, 255), (self.rect.x + self.radius / 2, self.rect.y + self.radius / 2),self.radius))
         pygame.draw.circle(surface, (58, 189, 74), (self.rect.x + self.radius / 2, self.rect.y + self.radius / 2),self.radius - 1)
 
     def wall_collision(self):
         collide_points = (self.rect.midbottom, self.rect.bottomleft, self.rect.bottomright)
-        for wall in self.game.world_manager.current_map.wall_list:
-            if any(wall.hitbox.collidepoint(point) for point in collide_points):
-                self.game.particle_manager.add_particle(WallHitParticle(self.game, self.rect.x, self.rect.y))
-                self.kill()
-                break
+        if self.game.world_manager.current_map.wall_collision(collide_points):
+            self.game.particle_manager.add_particle(pool.acquire(WallHitParticle, self.game, self.rect.x, self.rect.y))
+            self.kill()
 
     def player_collision(self, collision_enemy):
         if self.rect.colliderect(collision_enemy.hitbox) and not self.game.world_manager.switch_room:
@@ -553,63 +617,75 @@ class Bullet():
             else:
                 self.game.player.hp -= self.damage
                 self.game.player.hurt = True
-                self.game.player.entity_animation.hurt_timer = pygame.time.get_ticks()
+                self.game.player.hurt_timer = get_ticks()
             self.sparkle()
             self.kill()
 
     def sparkle(self):
-        for _ in range(random.randint(2, 4)):
-            self.game.particle_manager.particle_list.append(EnemyHitParticle(self.game, self.rect.x, self.rect.y))
+        for _ in range(rng.cosmetic.randint(2, 4)):
+            self.game.particle_manager.add_particle(pool.acquire(EnemyHitParticle, self.game, self.rect.x, self.rect.y))
 
     def bounce(self):
         if (
                 self.game.player.weapon
                 and self.game.player.attacking
-                and pygame.sprite.collide_mask(self.game.player.weapon, self)
+                and self.deflectable
                 and self.bounce_back
+                and pygame.sprite.collide_mask(self.game.player.weapon, self)
         ):
-            self.dir = (-self.dir[0] + random.randint(-20, 10) / 100, -self.dir[1] + random.randint(-10, 10) / 100)
-            self.speed *= random.randint(10, 20) / 10
+            self.dir = (-self.dir[0] + rng.ai.randint(-20, 10) / 100, -self.dir[1] + rng.ai.randint(-10, 10) / 100)
+            self.speed *= rng.ai.randint(10, 20) / 10
             self.bounce_back = False
-            self.game.sound_manager.play(pygame.mixer.Sound('assets/sound/Hit.wav'))
+            self.game.sound_manager.play('bounce')
 
 
 class ImpBullet(Bullet):
-    speed = 5
+    __slots__ = ()
+    bullet_speed = 5
     bullet_size = 7
     radius = 5
 
-    def __init__(self, game, master, room, x, y, target):
-        super().__init__(game, master, room, x, y, target)
+    def reset(self, game, master, room, x, y, target):
+        super().reset(game, master, room, x, y, target)
         self.damage = master.damage
 
 
 class ShotgunBullet(Bullet):
-    speed = 9
+    __slots__ = ('weapon',)
+    bullet_speed = 9
     bullet_size = 12
     radius = 7
 
-    def __init__(self, game, master, room, x, y, target):
-        super().__init__(game, master, room, x, y, target)
+    def reset(self, game, master, room, x, y, target):
+        super().reset(game, master, room, x, y, target)
         self.damage = 25 * self.game.player.strength
         self.bounce_back = False
         self.weapon = objects.weapon.Shotgun
 
     def hit_enemy(self):
-        for enemy in self.game.enemy_manager.enemy_list:
+        for enemy in self.game.enemy_manager.enemies_near(self.rect):
             if self.rect.colliderect(enemy.hitbox) and enemy.can_get_hurt_from_weapon():
                 enemy.hp -= self.damage
-                enemy.entity_animation.hurt_timer = pygame.time.get_ticks()
+                enemy.hurt_timer = get_ticks()
                 enemy.hurt = True
-                enemy.weapon_hurt_cooldown = pygame.time.get_ticks()
-                self.game.particle_manager.particle_list.append(EnemyHitParticle(self.game, self.rect.x, self.rect.y))
+                enemy.weapon_hurt_cooldown = get_ticks()
+                self.game.particle_manager.add_particle(pool.acquire(EnemyHitParticle, self.game, self.rect.x, self.rect.y))
                 self.kill()
 
+    def kill(self):
+        if self.killed:
+            return
+        self.killed = True
+        self.master.kill(self)  # the shotgun keeps its own bullets
+        self.game.sound_manager.play('impact')
+
     def update(self):
         self.wall_collision()
+        if self.killed:
+            return
         self.update_position()
         self.hit_enemy()
-        if self.rect.y < 0 or self.rect.y > 1000 or self.rect.x < 0 or self.rect.x > 1400:
+        if not self.killed and (self.rect.y < 0 or self.rect.y > 1000 or self.rect.x < 0 or self.rect.x > 1400):
             self.kill()
 
     def draw(self):
@@ -619,23 +695,23 @@ class ShotgunBullet(Bullet):
 
 
 class DestroyerBullet(Bullet):
+    __slots__ = ()
     bullet_size = 12
     radius = 7
 
-    def __init__(self, game, master, room, x, y, target):
-        super().__init__(game, master, room, x, y, target)
-        self.calculate_dir()
+    def reset(self, game, master, room, x, y, target):
+        super().reset(game, master, room, x, y, target)
         self.damage = 25 * self.game.player.strength
         self.bounce_back = False
 
     def hit_enemy(self):
-        for enemy in self.game.enemy_manager.enemy_list:
+        for enemy in self.game.enemy_manager.enemies_near(self.rect):
             if self.rect.colliderect(enemy.hitbox) and enemy.can_get_hurt_from_weapon():
                 enemy.hp -= self.damage
-                enemy.entity_animation.hurt_timer = pygame.time.get_ticks()
+                enemy.hurt_timer = get_ticks()
                 enemy.hurt = True
-                enemy.weapon_hurt_cooldown = pygame.time.get_ticks()
-                self.game.particle_manager.particle_list.append(EnemyHitParticle(self.game, self.rect.x, self.rect.y))
+                enemy.weapon_hurt_cooldown = get_ticks()
+                self.game.particle_manager.add_particle(pool.acquire(EnemyHitParticle, self.game, self.rect.x, self.rect.y))
                 self.kill()
 
     def update(self):
@@ -645,22 +721,23 @@ class DestroyerBullet(Bullet):
             self.kill()
 
 class RevolverBullet(Bullet):
+    __slots__ = ()
     bullet_size = 12
     radius = 7
 
-    def __init__(self, game, master, room, x, y, target):
-        super().__init__(game, master, room, x, y, target)
+    def reset(self, game, master, room, x, y, target):
+        super().reset(game, master, room, x, y, target)
         self.damage = 25 * self.game.player.strength
         self.bounce_back = False
 
     def hit_enemy(self):
-        for enemy in self.game.enemy_manager.enemy_list:
+        for enemy in self.game.enemy_manager.enemies_near(self.rect):
             if self.rect.colliderect(enemy.hitbox) and enemy.can_get_hurt_from_weapon():
                 enemy.hp -= self.damage
-                enemy.entity_animation.hurt_timer = pygame.time.get_ticks()
+                enemy.hurt_timer = get_ticks()
                 enemy.hurt = True
-                enemy.weapon_hurt_cooldown = pygame.time.get_ticks()
-                self.game.particle_manager.particle_list.append(EnemyHitParticle(self.game, self.rect.x, self.rect.y))
+                enemy.weapon_hurt_cooldown = get_ticks()
+                self.game.particle_manager.add_particle(pool.acquire(EnemyHitParticle, self.game, self.rect.x, self.rect.y))
                 self.kill()
 
     def update(self):
@@ -676,57 +753,247 @@ class RevolverBullet(Bullet):
 
 
 class BossBullet(Bullet):
-    speed = 7
+    __slots__ = ()
+    bullet_speed = 7
     bullet_size = 7
     radius = 5
 
-    def __init__(self, game, master, room, x, y, target, rotation=None):
-        super().__init__(game, master, room, x, y, target)
+    def reset(self, game, master, room, x, y, target, rotation=None):
+        super().reset(game, master, room, x, y, target)
         if rotation:
             self.dir.rotate_ip(rotation)
         self.damage = master.bullet_damage
 
     def kill(self):
-        if self in self.game.bullet_manager.bullets:
-            self.game.bullet_manager.bullets.remove(self)
+        if not self.killed:
+            self.killed = True
+            self.game.bullet_manager.kill(self)
 
 
 class MachineGunBullet(BossBullet):
-
-    def __init__(self, game, master, room, x, y, target, rotation=None):
-        super().__init__(game, master, room, x, y, target)
-
-    def update(self):
-        self.update_position()
-        self.player_collision(self.game.player)
-        if self.rect.y < 0 or self.rect.y > 1000 or self.rect.x < 0 or self.rect.x > 1300:
-            self.kill()
-        self.wall_collision()
+    __slots__ = ()
+    deflectable = False
 
 
 class BulletManager:
+    """Owns the bullets of the current room. With batched set, movement, culling and the player, weapon and wall
+    tests run over NumPy arrays of every bullet at once and bullet methods are called only for the bullets a test
+    hit; a tick then handles its bullets test by test instead of bullet by bullet, which reorders their random
+    draws. Bullet pos and rect are only brought up to date for those calls."""
+    batched = False  # simulate bullets using the stock Bullet.update as arrays instead of calling update on each
+    bounds = (0, 0, 1300, 1000)  # bullets leaving it are killed, as in Bullet.update
+    fields = {'x': float, 'y': float, 'dx': float, 'dy': float, 'speed': float,
+              'size': numpy.int32,  # bullet_size, bullets are square
+              'kind': numpy.int16,  # index into kinds
+              'custom': bool,  # the class has its own update, such bullets move and collide themselves
+              'deflected': bool,  # bounced back by the weapon, now hurts enemies
+              'dead': bool}
 
     def __init__(self, game):
         self.game = game
         self.bullets = []
+        for field, dtype in self.fields.items():
+            setattr(self, field, numpy.zeros(0, dtype=dtype))
+        self.kinds = []  # bullet classes seen so far
+        self.rows = {}  # id(bullet) -> row in the arrays
+        self.room = None  # room the bullets were last checked against
+        self.wall_map = None
+        self.walls = None  # wall hitboxes of wall_map as a boolean pixel grid
+        self.sprites = {}  # radius -> the circles of Bullet.draw
+        self.killed = []  # taken out of the list this tick, released to the pool once the tick is over
 
     def remove_bullets(self):
-        for bullet in self.bullets:
-            if self.game.world_manager.current_room is not bullet.room:
-                self.bullets.remove(bullet)
-                #self.kill(bullet)
+        room = self.game.world_manager.current_room
+        for bullet in [bullet for bullet in self.bullets if bullet.room is not room]:
+            self.kill(bullet)
 
     def add_bullet(self, bullet):
         self.bullets.append(bullet)
 
     def kill(self, bullet):
-        self.bullets.remove(bullet)
+        """Removes a bullet, it goes back to the pool at the end of the tick, killing it again does nothing"""
+        row = self.rows.get(id(bullet))
+        if row is not None and row < len(self.bullets) and self.bullets[row] is bullet:
+            self.dead[row] = True  # removed with the other killed rows at the end of the tick, see compact
+        elif bullet in self.bullets:
+            self.bullets.remove(bullet)
+            self.killed.append(bullet)
+
+    def release_killed(self):
+        """Hands the bullets killed this tick back to the pool, nothing refers to them any more"""
+        for bullet in self.killed:
+            pool.release(bullet)
+        self.killed.clear()
 
     def update(self):
+        if self.batched:
+            self.update_batch()
+            return
         self.remove_bullets()
-        for bullet in self.bullets:
+        for bullet in self.bullets[:]:  # bullets remove themselves while updating
             bullet.update()
+        self.release_killed()
 
     def draw(self):
+        if self.batched:
+            self.draw_batch()
+            return
         for bullet in self.bullets:
-            bullet.draw()
\ No newline at end of file
+            bullet.draw()
+
+    def sync(self):
+        """Adds the bullets appended since the last tick to the arrays, rebuilds them when bullets were taken out
+        of the list without kill"""
+        count = len(self.x)
+        if count > len(self.bullets) or len(self.rows) != count:
+            count = 0
+            self.rows.clear()
+        added = self.bullets[count:]
+        if not added:
+            return
+        for bullet in added:
+            if type(bullet) not in self.kinds:
+                self.kinds.append(type(bullet))
+        custom = [type(bullet).update is not Bullet.update for bullet in added]
+        room = self.game.world_manager.current_room
+        columns = {'x': [bullet.pos[0] for bullet in added], 'y': [bullet.pos[1] for bullet in added],
+                   'dx': [bullet.dir[0] for bullet in added], 'dy': [bullet.dir[1] for bullet in added],
+                   'speed': [0 if own else bullet.speed for bullet, own in zip(added, custom)],
+                   'size': [bullet.bullet_size for bullet in added],
+                   'kind': [self.kinds.index(type(bullet)) for bullet in added],
+                   'custom': custom,
+                   'deflected': [not bullet.bounce_back for bullet in added],
+                   'dead': [bullet.room is not room for bullet in added]}
+        for field, values in columns.items():
+            array = getattr(self, field)
+            setattr(self, field, numpy.concatenate((array[:count], numpy.array(values, dtype=array.dtype))))
+        for row, bullet in enumerate(added, count):
+            self.rows[id(bullet)] = row
+
+    def wall_raster(self):
+        tile_map = self.game.world_manager.current_map
+        if tile_map is not self.wall_map:
+            width, height = tile_map.map_size
+            self.walls = numpy.zeros((height, width), dtype=bool)
+            for hitboxes in tile_map.wall_grid.values():
+                for hitbox in hitboxes:
+                    self.walls[max(hitbox.top, 0):max(hitbox.bottom, 0), max(hitbox.left, 0):max(hitbox.right, 0)] = True
+            self.wall_map = tile_map
+        return self.walls
+
+    def in_wall(self, x, y):
+        """TileMap.wall_at for every point at once"""
+        walls = self.wall_raster()
+        height, width = walls.shape
+        inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        hit = numpy.zeros(len(x), dtype=bool)
+        hit[inside] = walls[y[inside], x[inside]]
+        return hit
+
+    def rect_positions(self):
+        """Positions as Rect stores them, halves rounded away from zero"""
+        return (numpy.trunc(self.x + numpy.copysign(0.5, self.x)).astype(numpy.int64),
+                numpy.trunc(self.y + numpy.copysign(0.5, self.y)).astype(numpy.int64))
+
+    def place(self, row, left, top):
+        """Brings the bullet of a row up to date for its methods"""
+        bullet = self.bullets[row]
+        bullet.pos = (float(self.x[row]), float(self.y[row]))
+        bullet.rect.topleft = (int(left[row]), int(top[row]))
+        return bullet
+
+    def update_batch(self):
+        room = self.game.world_manager.current_room
+        if room is not self.room:
+            self.room = room
+            self.remove_bullets()
+        self.sync()
+        if not self.bullets:
+            return
+        game = self.game
+        player = game.player
+        stock = ~self.custom & ~self.dead
+        self.x += self.dx * self.speed
+        self.y += self.dy * self.speed
+        left, top = self.rect_positions()
+        size = self.size
+        for row in numpy.flatnonzero(stock & self.deflected):
+            self.place(row, left, top).hit_enemy()
+        if not game.world_manager.switch_room:
+            hitbox = player.hitbox
+            touching = ((left < hitbox.right) & (left + size > hitbox.left) & (top < hitbox.bottom)
+                        & (top + size > hitbox.top) & stock)
+            for row in numpy.flatnonzero(touching):
+                self.place(row, left, top).player_collision(player)
+        weapon = player.weapon
+        if weapon and player.attacking:
+            mask = getattr(weapon, 'mask', None)
+            width, height = mask.get_size() if mask else weapon.image.get_size()
+            x, y = weapon.rect.topleft
+            near = ((left < x + width) & (left + size > x) & (top < y + height) & (top + size > y)
+                    & stock & ~self.deflected)  # collide_mask only finds bullets over the weapon mask
+            for row in numpy.flatnonzero(near):
+                bullet = self.place(row, left, top)
+                bullet.bounce()
+                self.dx[row], self.dy[row] = bullet.dir[0], bullet.dir[1]
+                self.speed[row] = bullet.speed
+                self.deflected[row] = not bullet.bounce_back
+        bound_left, bound_top, bound_right, bound_bottom = self.bounds
+        outside = ((top < bound_top) | (top > bound_bottom) | (left < bound_left) | (left > bound_right)) & stock
+        for row in numpy.flatnonzero(outside):
+            self.place(row, left, top).kill()
+        bottom = top + size
+        walled = (self.in_wall(left + size // 2, bottom) | self.in_wall(left, bottom)
+                  | self.in_wall(left + size, bottom)) & stock  # midbottom, bottomleft and bottomright
+        for row in numpy.flatnonzero(walled):
+            self.place(row, left, top).wall_collision()
+        for row in numpy.flatnonzero(self.custom & ~self.dead):
+            self.bullets[row].update()
+        self.compact()
+
+    def compact(self):
+        """Drops the killed rows from the list and the arrays in one pass and returns their bullets to the pool"""
+        self.release_killed()
+        dead = self.dead
+        if not dead.any():
+            return
+        bullets = self.bullets
+        for row in numpy.flatnonzero(dead):
+            pool.release(bullets[row])
+        alive = ~dead
+        bullets[:] = [bullet for bullet, keep in zip(bullets, alive.tolist()) if keep]
+        for field in self.fields:
+            setattr(self, field, getattr(self, field)[alive])
+        self.rows = {id(bullet): row for row, bullet in enumerate(bullets)}
+
+    def sprite(self, radius):
+        """The two circles of Bullet.draw on a transparent square, blitted radius + 1 up and left of the rect"""
+        if radius not in self.sprites:
+            offset = radius + 1
+            image = pygame.Surface((2 * offset + radius, 2 * offset + radius), pygame.SRCALPHA).convert_alpha()
+            center = (offset + radius / 2, offset + radius / 2)
+            pygame.draw.circle(image, (255, 255, 255), center, radius)
+            pygame.draw.circle(image, (58, 189, 74), center, radius - 1)
+            self.sprites[radius] = image
+        return self.sprites[radius]
+
+    def draw_batch(self):
+        self.sync()
+        if not self.bullets:
+            return
+        surface = self.game.world_manager.current_map.map_surface
+        left, top = self.rect_positions()
+        stock = [kind.update is Bullet.update and kind.draw is Bullet.draw for kind in self.kinds]
+        sprites = [self.sprite(kind.radius) if plain else None for kind, plain in zip(self.kinds, stock)]
+        offsets = numpy.array([kind.radius + 1 if plain else 0 for kind, plain in zip(self.kinds, stock)])
+        drawn = ~self.dead
+        blitted = numpy.array(stock)[self.kind] & drawn
+        rows = numpy.flatnonzero(blitted)  # in list order, overlapping bullets cover each other as drawn one by one
+        offset = offsets[self.kind[rows]]
+        positions = zip((left[rows] - offset).tolist(), (top[rows] - offset).tolist())
+        surface.blits(zip(map(sprites.__getitem__, self.kind[rows].tolist()), positions), False)
+        for row in numpy.flatnonzero(drawn & ~blitted):
+            if self.custom[row]:
+                self.bullets[row].draw()
+            else:
+                self.place(row, left, top).draw()
@@ -1,13 +1,21 @@
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from map_generator import World
+from random_manager import rng
 import utils as utils
 import pygame
 
+worldgen_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='worldgen')
+
 
 class WorldManager:
     number_of_rooms = 10  # add random values?
     world_width = 4
     world_height = 4
     level = 1
+    build_budget = 0.008  # s per frame spent building the next level's rooms during the fall transition
 
     def __init__(self, game):
         self.game = game
@@ -21,21 +29,64 @@ class WorldManager:
         self.direction, self.value = None, None
         self.new_level = False
         self.move_current_room = False
+        self.next_world = None  # Future of the next level's World, planned in a worker while this level is played
+        self.world_builder = None  # World.build_steps of the next level, stepped during the transition
+        self.materialize_queue = deque()  # TileMaps of rooms next to the current one, built one per frame
         self.load_world_manager()
 
-    def load_world_manager(self):
-        self.world = World(self, self.game, self.number_of_rooms, self.world_width, self.world_height)
+    def load_world_manager(self, world=None):
+        self.world = world or World(self, self.game, self.number_of_rooms, self.world_width, self.world_height)
         self.x, self.y = self.world.starting_room.x, self.world.starting_room.y
         self.current_room = self.world.starting_room
         self.current_map = self.current_room.tile_map
+        self.queue_neighbours(self.current_room)
         self.next_room = None
         self.next_room_map = None
         self.switch_room = False
         self.direction, self.value = None, None
+        self.prefetch_next_level()
+
+    def prefetch_next_level(self):
+        """Plans the next level's rooms and tile layers in a worker thread, surfaces are built later on this thread.
+
+        The worker gets a stream of its own, seeded from worldgen, so seeded runs stay reproducible."""
+        stream = random.Random(rng.worldgen.getrandbits(32))
+        self.next_world = worldgen_executor.submit(World, self, self.game, self.number_of_rooms, self.world_width,
+                                                   self.world_height, stream, self.level + 1, build=False)
+        self.world_builder = None
+
+    def cancel_next_level(self):
+        """Drops the next level's plan when this WorldManager is thrown away, a plan still queued never runs and a
+        running one is left to finish without anything keeping its World"""
+        if self.next_world is not None:
+            self.next_world.cancel()
+        self.next_world = None
+        self.world_builder = None
+
+    def build_next_level(self, budget=None):
+        """Builds next level rooms until the frame budget is used up, None builds all that are left"""
+        if self.world_builder is None:
+            self.world_builder = self.next_world.result().build_steps()  # waits only if planning is still running
+        deadline = None if budget is None else time.perf_counter() + budget
+        for _ in self.world_builder:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
 
     def set_current_room(self, room):
         self.current_room = room
         self.current_map = room.tile_map
+        self.queue_neighbours(room)
+
+    def neighbour_rooms(self, room):
+        offsets = {'up': (-1, 0), 'down': (1, 0), 'left': (0, -1), 'right': (0, 1)}
+        for direction in set(room.doors) & set(offsets):
+            x, y = room.x + offsets[direction][0], room.y + offsets[direction][1]
+            if 0 <= x < len(self.world.world) and 0 <= y < len(self.world.world[x]) and self.world.world[x][y]:
+                yield self.world.world[x][y]
+
+    def queue_neighbours(self, room):
+        """Rooms behind the doors get their surfaces built ahead of time, the rest stay as tile data"""
+        self.materialize_queue = deque(neighbour.tile_map for neighbour in self.neighbour_rooms(room))
 
     def set_next_room(self, room=None):
         self.next_room = room
@@ -64,6 +115,8 @@ class WorldManager:
         self.end_condition()
 
     def update(self):
+        if self.materialize_queue and not self.switch_room:
+            self.materialize_queue.popleft().materialize()
         self.detect_next_room()
         if self.switch_room:
             self.move_rooms(self.direction, self.value)
@@ -138,13 +191,15 @@ class WorldManager:
     def move_room(self):
         anim_speed = 30
         self.current_map.x += anim_speed
+        self.build_next_level(self.build_budget)
         self.end_conditi()
 
     def end_conditi(self):
         if self.current_map.x > 1100:
             self.new_level = False
             self.level += 1
-            self.load_world_manager()
+            self.build_next_level()  # whatever the transition frames did not get to
+            self.load_world_manager(self.next_world.result())
             self.current_map.x = -20 * 64
             self.move_current_room = True
             self.game.player.fall(-300)